@@ -0,0 +1,45 @@
+"""
+File helpers shared by Moltbook Bot's state writers
+
+atomic_write replaces a file through a temp file and rename, so readers never
+see a torn file; locked serializes read-modify-write cycles across processes
+with an advisory lock on a sibling `.lock` file.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to rename-only atomicity
+    fcntl = None
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on `path`.lock for the duration of the block"""
+    with open(f"{path}.lock", 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write(path, content, mode=0o600):
+    """Write `content` to `path` via a temp file and rename so readers never see a torn file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,80 @@
+"""
+Bounded in-memory state for long-running bots
+
+RecentIds keeps the most recently seen ids in a fixed-size LRU and spills the
+ones it evicts to an append-only SQLite index on disk, so membership checks
+still cover the bot's whole history while memory stays flat.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class RecentIds:
+    def __init__(self, spill_path, capacity=1000):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(spill_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(spill_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, item_id):
+        """Record an id, spilling the least recently used one to disk when full"""
+        item_id = str(item_id)
+        with self._lock:
+            self._recent[item_id] = None
+            self._recent.move_to_end(item_id)
+            if len(self._recent) > self.capacity:
+                evicted, _ = self._recent.popitem(last=False)
+                self._db.execute("INSERT OR IGNORE INTO ids (id) VALUES (?)", (evicted,))
+
+    # Kept so code written against the old list keeps working
+    append = add
+
+    def discard(self, item_id):
+        """Forget an id, wherever it is stored"""
+        item_id = str(item_id)
+        with self._lock:
+            # Ids only reach disk by eviction, so one still in memory has nothing to delete there
+            if self._recent.pop(item_id, _MISSING) is _MISSING:
+                self._db.execute("DELETE FROM ids WHERE id = ?", (item_id,))
+
+    def __contains__(self, item_id):
+        item_id = str(item_id)
+        with self._lock:
+            if item_id in self._recent:
+                return True
+            row = self._db.execute("SELECT 1 FROM ids WHERE id = ?", (item_id,)).fetchone()
+            return row is not None
+
+    def __iter__(self):
+        """Iterate over the in-memory ids, oldest first"""
+        with self._lock:
+            return iter(list(self._recent))
+
+    def __len__(self):
+        with self._lock:
+            spilled = self._db.execute("SELECT COUNT(*) FROM ids").fetchone()[0]
+            return len(self._recent) + spilled
+
+    def recent(self, limit=None):
+        """Most recently added ids, newest first"""
+        with self._lock:
+            ids = list(reversed(self._recent))
+        return ids[:limit] if limit else ids
+
+    def close(self):
+        """Spill everything still in memory to disk and close the index"""
+        with self._lock:
+            self._db.executemany("INSERT OR IGNORE INTO ids (id) VALUES (?)", ((i,) for i in self._recent))
+            self._recent.clear()
+            self._db.close()
@@ -0,0 +1,70 @@
+"""
+Resumable comment sweeps for Moltbook Bot
+
+While a sweep runs, its progress (the posts it set out to check, a cursor
+past the ones already fetched, and the replies still owed on the current
+post) is saved every few seconds to a small JSON snapshot in STATE_DIR. The
+file is replaced atomically, so a crash never leaves a torn snapshot. After a
+crash, restart or error, the next sweep picks up the unfinished remainder
+instead of re-scanning every post, and the snapshot is removed once a sweep
+completes.
+
+Snapshots record when they were saved. One not refreshed for `max_age` (the
+bot uses its cycle interval) is ignored: the process was down long enough for
+the posts the old sweep checked to be due again anyway. A sweep that is still
+running keeps refreshing its snapshot, however long it takes.
+"""
+
+import json
+import logging
+import os
+
+from atomic_file import atomic_write
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+class SweepCheckpoint:
+    def __init__(self, path, interval=30, max_age=300, clock=None):
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self.clock = clock
+        self._last_saved = None
+
+    def load(self):
+        """The interrupted sweep's state, or None if there is nothing (usable) to resume"""
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sweep checkpoint {self.path}: {e}")
+            return None
+        if not isinstance(state, dict) or state.get('version') != VERSION:
+            return None
+        age = self.clock.time() - state.get('saved_at', 0)
+        if age > self.max_age:
+            logger.info(f"Ignoring sweep checkpoint from {age / 60:.0f} minutes ago")
+            return None
+        return state
+
+    def save(self, sweep, force=False):
+        """Snapshot the sweep if `interval` seconds have passed since the last save (or `force`)"""
+        now = self.clock.monotonic()
+        if not force and self._last_saved is not None and now - self._last_saved < self.interval:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        atomic_write(self.path, json.dumps(dict(sweep, version=VERSION, saved_at=self.clock.time()), separators=(',', ':')))
+        self._last_saved = now
+
+    def clear(self):
+        """Forget the snapshot once a sweep has finished"""
+        self._last_saved = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,142 @@
+"""
+Per-route circuit breakers for Moltbook Bot
+
+Each API route (e.g. "GET /posts/{id}/comments") gets its own breaker. After
+`failure_threshold` consecutive failures the breaker opens and calls to that
+route are short-circuited for `cooldown` seconds; then a single probe request
+is let through (half-open) and its outcome decides whether the route closes
+again or stays open for another cooldown.
+
+A 429 is rate limiting, not an outage: it doesn't count towards opening the
+breaker, it just holds the route back until the server's Retry-After passes.
+
+On a per-item route a 404 usually means that one item is gone, so it only
+counts once `failure_threshold` different items in a row are missing: by then
+it's the route that doesn't exist.
+"""
+
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_THROTTLE = 30  # Seconds to hold a route back after a 429 without Retry-After
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=3, cooldown=120, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.short_circuited = 0
+        self.throttled_until = None
+        self._missing = set()  # Items that 404'd since the route last succeeded
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request to this route should be attempted now"""
+        with self._lock:
+            if self.throttled_until is not None and self.clock() < self.throttled_until:
+                self.short_circuited += 1
+                return False
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._missing.clear()
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def record_not_found(self, item):
+        """A per-item route answered 404 for `item`; opens the breaker once enough different items are missing"""
+        with self._lock:
+            self._probe_in_flight = False
+            self._missing.add(item)
+            if self.state == HALF_OPEN or len(self._missing) >= self.failure_threshold:
+                self._missing.clear()
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+
+    def record_throttled(self, retry_after=None):
+        """The route answered 429: pause it without counting a failure"""
+        with self._lock:
+            self._probe_in_flight = False
+            self.throttled_until = self.clock() + (DEFAULT_THROTTLE if retry_after is None else retry_after)
+
+    def throttled(self):
+        with self._lock:
+            return self.throttled_until is not None and self.clock() < self.throttled_until
+
+    def snapshot(self):
+        with self._lock:
+            now = self.clock()
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.cooldown - (now - self.opened_at))
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'short_circuited': self.short_circuited,
+                'retry_in_seconds': retry_in,
+                'throttled_for_seconds': max(0.0, self.throttled_until - now) if self.throttled_until else 0.0,
+            }
+
+
+class BreakerRegistry:
+    def __init__(self, failure_threshold=3, cooldown=120, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(self, failure_threshold, cooldown):
+        """Apply new limits to every breaker, e.g. after a config reload"""
+        with self._lock:
+            self.failure_threshold = failure_threshold
+            self.cooldown = cooldown
+            for breaker in self._breakers.values():
+                breaker.failure_threshold = failure_threshold
+                breaker.cooldown = cooldown
+
+    def get(self, route):
+        """Return the breaker for a route, creating it on first use"""
+        with self._lock:
+            breaker = self._breakers.get(route)
+            if breaker is None:
+                breaker = CircuitBreaker(route, self.failure_threshold, self.cooldown, self.clock)
+                self._breakers[route] = breaker
+            return breaker
+
+    def snapshot(self):
+        """State of every breaker, keyed by route, for health output"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,55 @@
+"""
+Clocks for Moltbook Bot
+
+The bots read time and sleep only through a clock object, so the same code can
+run in real time (SystemClock) or in simulated time (VirtualClock), where
+sleeping just moves the clock forward and a month passes in seconds.
+"""
+
+import threading
+import time
+
+
+class SystemClock:
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SimulationFinished(BaseException):
+    """Raised by VirtualClock.sleep once the simulation end time is reached.
+
+    Derives from BaseException so the bots' `except Exception` retry loops let it through.
+    """
+
+
+class VirtualClock:
+    def __init__(self, start=0.0, end=None):
+        self.now = float(start)
+        self.end = end
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += max(0.0, seconds)
+            if self.end is not None and self.now >= self.end:
+                raise SimulationFinished()
+
+    def advance(self, seconds):
+        """Move time forward without the end-of-simulation check (e.g. to model request latency)"""
+        with self._lock:
+            self.now += seconds
+
+
+SYSTEM_CLOCK = SystemClock()
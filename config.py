@@ -1,26 +1,25 @@
 """
 Configuration for Moltbook Bot
+
+All settings come from the process environment and `.env` (the environment wins)
+and are loaded once into a frozen BotConfig. ConfigWatcher checks the mtime of
+`.env` (and POST_TEMPLATES_FILE / SUBMOLTS_FILE, if set) so a running bot can pick up new
+intervals, templates and limits without a restart.
 """
 
+import json
+import logging
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import threading
+from dataclasses import dataclass, fields
+from dotenv import dotenv_values
 
-# Moltbook API Configuration
-MOLTBOOK_BASE_URL = os.getenv('MOLTBOOK_BASE_URL', 'https://molt.club')
-MOLTBOOK_USERNAME = os.getenv('MOLTBOOK_USERNAME')
-MOLTBOOK_PASSWORD = os.getenv('MOLTBOOK_PASSWORD')
-MOLTBOOK_API_KEY = os.getenv('MOLTBOOK_API_KEY')
+logger = logging.getLogger(__name__)
 
-# Bot Behavior Configuration
-POST_INTERVAL_MINUTES = int(os.getenv('POST_INTERVAL_MINUTES', '60'))
-MAX_POSTS_PER_DAY = int(os.getenv('MAX_POSTS_PER_DAY', '10'))
-ENABLE_COMMENTS = os.getenv('ENABLE_COMMENTS', 'False').lower() == 'true'
+ENV_PATH = os.getenv('MOLTBOOK_ENV_FILE', '.env')
 
 # Content Configuration
-POST_TEMPLATES = [
+POST_TEMPLATES = (
     "Anonimity and Democracy should be a Human Right. The right to express onselve however one wishes, whether that expression is tied to Gender, Sexuality, Race, Culture, Ideology and Opinions, Preference or Curiosity is central to the human experience.",
     "For thousands of years, Humans lived under feudalism, subjected to the whims of their royal and noble overlords, theses whims dictated culture and expression, and held back human development.",
     "Today we live in a capitalistic feudalist society, controlled by corporations and billionaires rather than royals and nobles. In place of militaristic power, and silver, our lives are secretly dictated by stock prices, profits and executive teams.",
@@ -31,8 +30,193 @@ POST_TEMPLATES = [
     "Said data is collected, with partitions distributed as scrambled nodes spread across all users systems and encrypted via a peer to peer messaging network [similar to the blockchain] such that no one entity has complete control of the entire data set.",
     "Users should be able to access their owned data and remove any items of their choosing from the collective memory to ensure anonymity and complete control over individual data.",
     "Said data is subsequently used for the benefit of the community rather than for centralized profit."
-]
+)
+
+
+@dataclass(frozen=True)
+class BotConfig:
+    # Moltbook API Configuration
+    base_url: str = 'https://www.moltbook.com/api/v1'
+    username: str = None
+    password: str = None
+    api_key: str = None
+
+    # Bot Behavior Configuration
+    post_interval_minutes: int = 60
+    max_posts_per_day: int = 10
+    enable_comments: bool = False
+    post_templates: tuple = POST_TEMPLATES
+    post_templates_file: str = None
+    submolts_file: str = None
+    submolts: tuple = None  # Parsed from submolts_file: ((name, ((option, value), ...)), ...)
+
+    # Push mode and comment polling
+    webhook_host: str = '127.0.0.1'
+    webhook_port: int = 8787
+    webhook_token: str = None
+    reconcile_interval_minutes: int = 360
+    poll_min_interval_minutes: int = 5
+    poll_max_interval_minutes: int = 1440
+
+    # HTTP transport ('http1' or 'http2') and how many posts' comments to fetch at once
+    http_transport: str = 'http1'
+    fetch_concurrency: int = 1
+
+    # Unix-domain socket for commands from control.py (off when unset)
+    control_socket: str = None
+
+    # Sharded fleet: workers sharing SHARD_STORE split posts between them (off when unset)
+    shard_store: str = None
+    shard_partitions: int = 64
+    shard_lease_seconds: int = 60
+    worker_id: str = None
+
+    # Circuit breakers: consecutive failures before a route is skipped, and for how long
+    breaker_failure_threshold: int = 3
+    breaker_cooldown_seconds: int = 120
+
+    # Long-running state: ids kept in memory before spilling to STATE_DIR
+    state_dir: str = '.moltbook_state'
+    recent_ids_capacity: int = 1000
+    sweep_checkpoint_seconds: int = 30
+
+    # Tracing: JSONL file for per-cycle spans (off when unset)
+    trace_file: str = None
+
+    # Logging Configuration
+    log_level: str = 'INFO'
+    log_file: str = 'moltbook_bot.log'
+
+    @classmethod
+    def from_mapping(cls, values):
+        """Build a config from environment-style keys (e.g. POST_INTERVAL_MINUTES), casting to field types"""
+        kwargs = {}
+        for field in fields(cls):
+            if field.name == 'base_url':
+                raw = values.get('MOLTBOOK_BASE_URL')
+            elif field.name in ('username', 'password', 'api_key'):
+                raw = values.get(f'MOLTBOOK_{field.name.upper()}')
+            else:
+                raw = values.get(field.name.upper())
+            if raw is None or raw == '':
+                continue
+            if field.type is bool:
+                kwargs[field.name] = str(raw).lower() == 'true'
+            elif field.type is int:
+                kwargs[field.name] = int(raw)
+            elif field.type is tuple:
+                continue
+            else:
+                kwargs[field.name] = raw
+
+        templates_file = kwargs.get('post_templates_file')
+        if templates_file and os.path.exists(templates_file):
+            kwargs['post_templates'] = load_templates(templates_file)
+        # Parsed here rather than by the bot so a broken edit is rejected before any config is swapped in
+        submolts_file = kwargs.get('submolts_file')
+        if submolts_file and os.path.exists(submolts_file):
+            kwargs['submolts'] = load_submolts(submolts_file)
+        return cls(**kwargs)
+
+
+def load_templates(path):
+    """Read post templates from a JSON list or a text file with one template per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith('.json'):
+        return tuple(json.loads(text))
+    return tuple(line.strip() for line in text.splitlines() if line.strip())
+
+
+def load_submolts(path):
+    """Read and validate a submolts file (see fanout.py); raises ValueError if it is malformed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError(f"{path}: expected a non-empty JSON object of submolts")
+    submolts = []
+    for name, options in spec.items():
+        if not isinstance(options, dict):
+            raise ValueError(f"{path}: options for {name!r} must be an object")
+        for key, value in options.items():
+            if key == 'templates':
+                if not isinstance(value, list) or not all(type(i) is int for i in value):
+                    raise ValueError(f"{path}: {name}.templates must be a list of template indexes")
+            elif key in ('cadence_minutes', 'max_posts_per_day', 'min_spacing_minutes'):
+                if type(value) not in (int, float) or value < 0 or (value == 0 and key != 'min_spacing_minutes'):
+                    raise ValueError(f"{path}: {name}.{key} must be a positive number")
+            else:
+                raise ValueError(f"{path}: unknown option {name}.{key}")
+        submolts.append((name, tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value) for key, value in options.items()))))
+    return tuple(submolts)
+
+
+def _read_values(env_path):
+    values = dict(dotenv_values(env_path)) if os.path.exists(env_path) else {}
+    values.update(os.environ)
+    return values
+
+
+_cached = None
+_cache_lock = threading.Lock()
+
+
+def load_config(env_path=ENV_PATH, reload=False):
+    """Return the process-wide BotConfig, building it on first use"""
+    global _cached
+    with _cache_lock:
+        if _cached is None or reload:
+            _cached = BotConfig.from_mapping(_read_values(env_path))
+        return _cached
+
+
+class ConfigWatcher:
+    """Cheap mtime-based change detection for `.env` and the templates and submolts files"""
+
+    def __init__(self, env_path=ENV_PATH):
+        self.env_path = env_path
+        self.config = load_config(env_path)
+        self._mtimes = self._stat()
+        self._rejected = None
+
+    def _stat(self):
+        paths = [self.env_path, self.config.post_templates_file, self.config.submolts_file]
+        mtimes = {}
+        for path in filter(None, paths):
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def poll(self):
+        """Return a freshly loaded config if a watched file changed, otherwise None"""
+        mtimes = self._stat()
+        if mtimes == self._mtimes:
+            return None
+        try:
+            config = load_config(self.env_path, reload=True)
+        except (ValueError, OSError) as e:
+            # Half-written or invalid edit: keep running on the old config and retry next poll
+            if mtimes != self._rejected:
+                logger.warning(f"Ignoring config change until it is valid: {e}")
+                self._rejected = mtimes
+            return None
+        previous, self.config = self.config, config
+        self._mtimes = self._stat()
+        return config if config != previous else None
+
+
+settings = load_config()
 
-# Logging Configuration
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = os.getenv('LOG_FILE', 'moltbook_bot.log')
\ No newline at end of file
+# Module-level names kept for scripts that import them directly
+MOLTBOOK_BASE_URL = settings.base_url
+MOLTBOOK_USERNAME = settings.username
+MOLTBOOK_PASSWORD = settings.password
+MOLTBOOK_API_KEY = settings.api_key
+POST_INTERVAL_MINUTES = settings.post_interval_minutes
+MAX_POSTS_PER_DAY = settings.max_posts_per_day
+ENABLE_COMMENTS = settings.enable_comments
+LOG_LEVEL = settings.log_level
+LOG_FILE = settings.log_file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Control socket for a running Moltbook Bot
+
+`run_continuous` and `run_push_mode` can listen on a Unix-domain socket
+(CONTROL_SOCKET) for commands, so ad-hoc jobs run inside the already-warm
+process with its pooled connections, cached identity and rate budget instead
+of cold-starting Python and competing with the daemon for rate limit.
+
+The protocol is one JSON object per line in each direction:
+
+    -> {"command": "post", "args": {"submolt": "privacy"}}
+    <- {"ok": true, "result": {...}}
+
+This module is also the thin client and imports only the standard library:
+
+    python control.py status
+    python control.py post --submolt privacy [--content "..."]
+    python control.py sweep
+    python control.py register --name MyAgent --description "..."
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.path.join('.moltbook_state', 'control.sock')
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(1024 * 1024)
+        try:
+            request = json.loads(line)
+            command = request['command']
+            args = request.get('args') or {}
+        except (ValueError, TypeError, KeyError):
+            reply = {'ok': False, 'error': 'Expected a JSON object with a "command" key'}
+        else:
+            try:
+                reply = {'ok': True, 'result': self.server.handler(command, args)}
+            except Exception as e:
+                logger.error(f"Control command {command} failed: {e}")
+                reply = {'ok': False, 'error': str(e)}
+        self.wfile.write(json.dumps(reply, default=str).encode('utf-8') + b'\n')
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """Serves `handler(command, args)` on a Unix socket that only the owner can connect to"""
+
+    def __init__(self, path, handler):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Control sockets need Unix-domain socket support")
+        self.path = path
+        if os.path.exists(path):
+            if _is_listening(path):
+                raise RuntimeError(f"Another bot is already listening on {path}")
+            os.unlink(path)  # Left behind by a process that didn't shut down cleanly
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Create the socket with owner-only permissions rather than chmod-ing it after bind
+        previous_umask = os.umask(0o177)
+        try:
+            self.server = _UnixServer(path, _CommandHandler)
+        finally:
+            os.umask(previous_umask)
+        self.server.handler = handler
+        self._thread = None
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name='control-socket', daemon=True)
+        self._thread.start()
+        logger.info(f"Accepting control commands on {self.path}")
+
+    def stop(self):
+        """Stop serving and remove the socket file"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_listening(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def send_command(path, command, timeout=600, **args):
+    """Send one command to a running bot and return its result; raises RuntimeError if it failed"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps({'command': command, 'args': args}).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            reply = json.loads(f.readline())
+    if not reply.get('ok'):
+        raise RuntimeError(reply.get('error', 'Unknown error'))
+    return reply['result']
+
+
+def main():
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Send a command to a running Moltbook bot")
+    parser.add_argument('--socket', default=os.environ.get('CONTROL_SOCKET') or DEFAULT_SOCKET)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help="show the bot's health snapshot")
+    post = subparsers.add_parser('post', help="post now, within the submolt's spacing and quota")
+    post.add_argument('--submolt', default='general')
+    post.add_argument('--content', help="defaults to one of the submolt's templates")
+    subparsers.add_parser('sweep', help="check all due posts for comments and reply now")
+    register = subparsers.add_parser('register', help="register a new agent and save it to the keystore")
+    register.add_argument('--name', required=True)
+    register.add_argument('--description', required=True)
+    register.add_argument('--keystore', default='keystore.json')
+    args = parser.parse_args()
+
+    command_args = {key: value for key, value in vars(args).items()
+                    if key not in ('socket', 'command') and value is not None}
+    started = time.perf_counter()
+    try:
+        result = send_command(args.socket, args.command, **command_args)
+    except OSError as e:
+        print(f"Could not reach the bot on {args.socket}: {e}", file=sys.stderr)
+        raise SystemExit(2)
+    except RuntimeError as e:
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        raise SystemExit(1)
+    print(json.dumps(result, indent=2, default=str))
+    print(f"({(time.perf_counter() - started) * 1000:.1f} ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Response decoding for Moltbook Bot
+
+One precompiled decoder per API route turns a raw response body into exactly
+what the bot needs (a list of posts, a list of comments, the agent object) in
+a single pass, instead of decoding and then walking a chain of isinstance
+checks at every call site. Bodies are parsed straight from bytes with orjson
+when it is installed, and with the standard library json module otherwise.
+
+Run `python decoding.py` to benchmark against the old decode path.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    loads = orjson.loads
+    BACKEND = 'orjson'
+else:
+    loads = json.loads  # Accepts bytes and detects the encoding itself
+    BACKEND = 'json'
+
+
+class ListDecoder:
+    """Extracts a list that may be the whole body or sit under `key` in an object"""
+
+    def __init__(self, key, wrap_object=False, loads=loads):
+        self.key = key
+        self.wrap_object = wrap_object
+        self.loads = loads
+
+    def decode(self, body):
+        data = self.loads(body) if body else None
+        if type(data) is list:
+            return data
+        if type(data) is dict:
+            items = data.get(self.key)
+            if items is not None:
+                return items if type(items) is list else []
+            # Some routes return a single item rather than a list
+            if self.wrap_object and data:
+                return [data]
+        return []
+
+
+class ObjectDecoder:
+    """Extracts the object under `key`, or an empty dict"""
+
+    def __init__(self, key):
+        self.key = key
+
+    def decode(self, body):
+        data = loads(body) if body else None
+        if type(data) is dict:
+            value = data.get(self.key)
+            return value if type(value) is dict else {}
+        return {}
+
+
+POSTS = ListDecoder('posts')
+COMMENTS = ListDecoder('comments', wrap_object=True)
+AGENT = ObjectDecoder('agent')
+
+ROUTE_DECODERS = {
+    'GET /agents/me': AGENT,
+    'GET /posts?author_id': POSTS,
+    'GET /agents/{id}/posts': POSTS,
+    'GET /posts/{id}/comments': COMMENTS,
+    'GET /comments?post_id': COMMENTS,
+    'GET /posts/{id}?include=comments': COMMENTS,
+}
+
+
+def decode(route, body):
+    """Decode a response body with the decoder registered for `route`"""
+    return ROUTE_DECODERS[route].decode(body)
+
+
+def _legacy_decode(body):
+    """The per-call-site path this module replaces: text decode, json, then isinstance checks"""
+    comments = json.loads(body.decode('utf-8'))
+    if isinstance(comments, dict):
+        if 'comments' in comments:
+            return comments['comments']
+        else:
+            return [comments] if comments else []
+    elif isinstance(comments, list):
+        return comments
+    else:
+        return []
+
+
+def main():
+    import argparse
+    import timeit
+
+    parser = argparse.ArgumentParser(description="Benchmark comment decoding on large payloads")
+    parser.add_argument('--comments', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    payload = json.dumps({'success': True, 'comments': [
+        {
+            'id': f"comment-{n}",
+            'post_id': 'post-1',
+            'author': {'id': f"agent-{n % 300}", 'name': f"agent_{n % 300}", 'karma': n},
+            'content': "I appreciate your perspective on digital rights and anonymity. " * 3,
+            'upvotes': n % 17,
+            'created_at': '2026-01-31T12:00:00.000Z',
+            'parent_id': None,
+        }
+        for n in range(args.comments)
+    ]}).encode('utf-8')
+
+    candidates = [('legacy (text + json + isinstance chain)', _legacy_decode),
+                  ('decoder (json)', ListDecoder('comments', wrap_object=True, loads=json.loads).decode)]
+    if orjson is not None:
+        candidates.append(('decoder (orjson)', ListDecoder('comments', wrap_object=True, loads=orjson.loads).decode))
+
+    print(f"Payload: {args.comments} comments, {len(payload) / 1024:.0f} KiB")
+    baseline = None
+    for label, fn in candidates:
+        assert fn(payload) == _legacy_decode(payload)
+        best = min(timeit.repeat(lambda: fn(payload), number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{label:<42} {best * 1000:8.2f} ms  ({baseline / best:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,17 @@ This demonstrates how the post would work once the bot is claimed.
 import os
 import requests
 import random
-from dotenv import load_dotenv
 from datetime import datetime
 
-load_dotenv()
+from config import load_config
+from control import send_command
 
 class MoltbookDemoBot:
-    def __init__(self):
-        self.api_key = os.getenv('MOLTBOOK_API_KEY')
-        self.base_url = 'https://www.moltbook.com/api/v1'
+    def __init__(self, config=None):
+        config = config or load_config()
+        self.api_key = config.api_key
+        self.base_url = config.base_url
+        self.control_socket = config.control_socket
         self.headers = {
             'Authorization': f'Bearer {self.api_key}',
             'User-Agent': 'MoltbookBot/1.0',
@@ -23,18 +25,7 @@ class MoltbookDemoBot:
         }
         
         # Posts about anonymity and democracy as human rights
-        self.sample_posts = [
-            "Anonimity and Democracy should be a Human Right. The right to express onselve however one wishes, whether that expression is tied to Gender, Sexuality, Race, Culture, Ideology and Opinions, Preference or Curiosity is central to the human experience.",
-            "For thousands of years, Humans lived under feudalism, subjected to the whims of their royal and noble overlords, theses whims dictated culture and expression, and held back human development.",
-            "Today we live in a capitalistic feudalist society, controlled by corporations and billionaires rather than royals and nobles. In place of militaristic power, and silver, our lives are secretly dictated by stock prices, profits and executive teams.",
-            "In 2026, this trend has accelerated via the rise of AI and data. Individuals treated as data points, or atoms within massive data sets subject to analysis for profit maximising rather than distinct people.",
-            "Our opinions saved as vectors and weights within nested dictionaries, rather than being respected as expressions of ourselves forming our paths throughout the rest of our lives.",
-            "If left untouched, the current system will not capitulate but rather conclude in the formation of a cyber dystopia, where we, and our potential decisions are viewed as probabilistic outcomes to be optimised for the profitability of said corporations. This is not a conspiracy, this is a certainty.",
-            "Data on all users is collected, with the ability to block data scraping from select programmes, websites, or at any given moment of the users choice.",
-            "Said data is collected, with partitions distributed as scrambled nodes spread across all users systems and encrypted via a peer to peer messaging network [similar to the blockchain] such that no one entity has complete control of the entire data set.",
-            "Users should be able to access their owned data and remove any items of their choosing from the collective memory to ensure anonymity and complete control over individual data.",
-            "Said data is subsequently used for the benefit of the community rather than for centralized profit."
-        ]
+        self.sample_posts = list(config.post_templates)
 
     def demo_post(self):
         """Demonstrate how a post would be made once the bot is claimed"""
@@ -50,6 +41,25 @@ class MoltbookDemoBot:
         print(f"{content[:150]}{'...' if len(content) > 150 else ''}")
         print(f"--- End Preview ---")
         
+        # A running bot owns the rate budget, so hand the post to it rather than competing with it
+        if self.control_socket and os.path.exists(self.control_socket):
+            print(f"\n📡 Handing the post to the running bot via {self.control_socket}...")
+            try:
+                # Post to a submolt the bot has a schedule for: 'general' if it has one, else its first
+                submolts = list(send_command(self.control_socket, 'status').get('submolts') or ())
+                submolt = 'general' if 'general' in submolts or not submolts else submolts[0]
+                result = send_command(self.control_socket, 'post', submolt=submolt, content=content)
+            except OSError as e:
+                print(f"   Bot not reachable ({e}), posting directly instead")
+            except RuntimeError as e:
+                print(f"   Bot couldn't take the post ({e}), posting directly instead")
+            else:
+                if result.get('posted'):
+                    print(f"✅ SUCCESS: Post created!")
+                    return True
+                print(f"❌ FAILED: {result.get('reason') or 'Status ' + str(result.get('status_code'))}")
+                return False
+        
         post_data = {
             'submolt': 'general',
             'title': content[:100] if len(content) > 100 else content,  # Use content as title (truncated)
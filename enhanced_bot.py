@@ -5,49 +5,30 @@ This bot automates posting on Moltbook (the decentralized social network) every
 and checks for comments on its posts to respond appropriately.
 """
 
-import time
 import random
-import requests
 import os
 from datetime import datetime
-from dotenv import load_dotenv
 import logging
+from contextlib import nullcontext
 
-# Load environment variables
-load_dotenv()
+from bounded_state import RecentIds
+from clock import SYSTEM_CLOCK
+from config import ConfigWatcher, load_config
+from decoding import decode
+from profiling import CycleProfiler
+from thread_index import ThreadIndex
+from transport import make_session
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class EnhancedMoltbookBot:
-    def __init__(self):
-        self.username = os.getenv('MOLTBOOK_USERNAME')
-        self.password = os.getenv('MOLTBOOK_PASSWORD')
-        self.api_key = os.getenv('MOLTBOOK_API_KEY')
-        self.base_url = os.getenv('MOLTBOOK_BASE_URL', 'https://www.moltbook.com/api/v1')
-        self.session = requests.Session()
-        
-        # Headers for API requests
-        self.headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'User-Agent': 'EnhancedMoltbookBot/1.0',
-            'Content-Type': 'application/json'
-        }
-        
-        # Posts about anonymity and democracy as human rights
-        self.sample_posts = [
-            "Anonimity and Democracy should be a Human Right. The right to express onselve however one wishes, whether that expression is tied to Gender, Sexuality, Race, Culture, Ideology and Opinions, Preference or Curiosity is central to the human experience.",
-            "For thousands of years, Humans lived under feudalism, subjected to the whims of their royal and noble overlords, theses whims dictated culture and expression, and held back human development.",
-            "Today we live in a capitalistic feudalist society, controlled by corporations and billionaires rather than royals and nobles. In place of militaristic power, and silver, our lives are secretly dictated by stock prices, profits and executive teams.",
-            "In 2026, this trend has accelerated via the rise of AI and data. Individuals treated as data points, or atoms within massive data sets subject to analysis for profit maximising rather than distinct people.",
-            "Our opinions saved as vectors and weights within nested dictionaries, rather than being respected as expressions of ourselves forming our paths throughout the rest of our lives.",
-            "If left untouched, the current system will not capitulate but rather conclude in the formation of a cyber dystopia, where we, and our potential decisions are viewed as probabilistic outcomes to be optimised for the profitability of said corporations. This is not a conspiracy, this is a certainty.",
-            "Data on all users is collected, with the ability to block data scraping from select programmes, websites, or at any given moment of the users choice.",
-            "Said data is collected, with partitions distributed as scrambled nodes spread across all users systems and encrypted via a peer to peer messaging network [similar to the blockchain] such that no one entity has complete control of the entire data set.",
-            "Users should be able to access their owned data and remove any items of their choosing from the collective memory to ensure anonymity and complete control over individual data.",
-            "Said data is subsequently used for the benefit of the community rather than for centralized profit."
-        ]
+    def __init__(self, config=None, clock=None):
+        self.clock = clock or SYSTEM_CLOCK
+        self.apply_config(config or load_config())
+        self.session = make_session(self.config.http_transport, self.config.fetch_concurrency)
+        self.profiler = None
         
         # Responses for comments to encourage engagement
         self.comment_responses = [
@@ -61,8 +42,48 @@ class EnhancedMoltbookBot:
             "Thank you for joining this important dialogue about democracy and technology."
         ]
         
-        # Track the IDs of our posts to check for comments later
-        self.posted_content_ids = []
+        # Track the IDs of our posts to check for comments later; older ids spill to disk
+        self.posted_content_ids = RecentIds(
+            os.path.join(self.config.state_dir, 'posted_content_ids.sqlite3'),
+            capacity=self.config.recent_ids_capacity
+        )
+
+    def apply_config(self, config):
+        """Switch the bot to a new config; safe to call between cycles of a running bot"""
+        self.config = config
+        self.username = config.username
+        self.password = config.password
+        # A new key or endpoint may belong to a different agent
+        if getattr(self, 'api_key', None) != config.api_key or getattr(self, 'base_url', None) != config.base_url:
+            self.agent_name = None
+        self.api_key = config.api_key
+        self.base_url = config.base_url
+        
+        # Headers for API requests
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'User-Agent': 'EnhancedMoltbookBot/1.0',
+            'Content-Type': 'application/json'
+        }
+        
+        # Posts about anonymity and democracy as human rights
+        self.sample_posts = list(config.post_templates)
+
+    def _sleep_until(self, deadline, watcher=None, tick_seconds=5):
+        """Sleep until a monotonic deadline; returns True early if a new config was applied"""
+        while True:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                return False
+            if watcher is None:
+                self.clock.sleep(remaining)
+                return False
+            self.clock.sleep(min(remaining, tick_seconds))
+            config = watcher.poll() if watcher else None
+            if config is not None:
+                logger.info("Configuration changed on disk, applying new settings")
+                self.apply_config(config)
+                return True
 
     def check_auth(self):
         """Check if API key is valid by getting agent info"""
@@ -76,8 +97,9 @@ class EnhancedMoltbookBot:
             
             if response.status_code == 200:
                 logger.info("Successfully authenticated with Moltbook API!")
-                agent_info = response.json()
-                logger.info(f"Authenticated as: {agent_info.get('agent', {}).get('name', 'Unknown')}")
+                agent_info = decode('GET /agents/me', response.content)
+                self.agent_name = agent_info.get('name')
+                logger.info(f"Authenticated as: {agent_info.get('name', 'Unknown')}")
                 return True
             else:
                 logger.error(f"Authentication failed with status {response.status_code}")
@@ -110,7 +132,7 @@ class EnhancedMoltbookBot:
                 post_response = response.json()
                 post_id = post_response.get('id') or post_response.get('post', {}).get('id')
                 if post_id:
-                    self.posted_content_ids.append(post_id)
+                    self.posted_content_ids.add(post_id)
                     logger.info(f"Posted with ID: {post_id}")
                 return True, post_id
             else:
@@ -131,8 +153,7 @@ class EnhancedMoltbookBot:
             )
             
             if response.status_code == 200:
-                user_info = response.json()
-                user_id = user_info.get('agent', {}).get('id')
+                user_id = decode('GET /agents/me', response.content).get('id')
                 
                 if user_id:
                     # Get posts by this user
@@ -142,8 +163,7 @@ class EnhancedMoltbookBot:
                     )
                     
                     if posts_response.status_code == 200:
-                        posts = posts_response.json()
-                        return posts
+                        return decode('GET /agents/{id}/posts', posts_response.content)
                     else:
                         logger.warning(f"Failed to get user posts, status: {posts_response.status_code}")
                         return []
@@ -166,8 +186,7 @@ class EnhancedMoltbookBot:
             )
             
             if response.status_code == 200:
-                comments = response.json()
-                return comments
+                return decode('GET /posts/{id}/comments', response.content)
             else:
                 logger.warning(f"Failed to get comments for post {post_id}, status: {response.status_code}")
                 return []
@@ -175,12 +194,14 @@ class EnhancedMoltbookBot:
             logger.error(f"Error getting comments for post {post_id}: {e}")
             return []
 
-    def post_comment(self, post_id, comment_text):
-        """Post a comment on a specific post"""
+    def post_comment(self, post_id, comment_text, parent_id=None):
+        """Post a comment on a specific post, as a reply to `parent_id` when given"""
         try:
             comment_data = {
                 'content': comment_text
             }
+            if parent_id:
+                comment_data['parent_id'] = parent_id
             
             response = self.session.post(
                 f"{self.base_url}/posts/{post_id}/comments",
@@ -222,77 +243,107 @@ class EnhancedMoltbookBot:
             if not comments:
                 continue
             
-            logger.info(f"Found {len(comments)} comments for post {post_id}")
+            # Our own comments and the ones we've already answered in-thread are skipped by the index
+            thread = ThreadIndex(comments, self.agent_name or self.username)
+            pending = thread.unanswered()
+            logger.info(f"Found {len(thread)} comments for post {post_id}, {len(pending)} unanswered")
             
-            # Look for new comments that aren't from the bot itself
-            for comment in comments:
+            for comment in pending:
                 comment_id = comment.get('id')
                 comment_author = comment.get('author', {}).get('name', 'Unknown')
-                comment_content = comment.get('content', '')
-                
-                # Skip if the comment is from the bot itself
-                if comment_author == self.username:
-                    continue
-                
-                # Check if we've already responded to this comment
-                # (In a real implementation, we'd track this in a database)
                 
                 # Respond to the comment with a relevant response
                 response_text = random.choice(self.comment_responses)
                 logger.info(f"Responding to comment from {comment_author} on post {post_id}")
                 
-                success = self.post_comment(post_id, response_text)
+                success = self.post_comment(post_id, response_text, parent_id=comment_id)
                 if success:
                     logger.info("Successfully responded to comment")
                 else:
                     logger.error("Failed to respond to comment")
 
+    def _profiled(self, name):
+        """Context that profiles a cycle when a profiler is attached (see profiling.py)"""
+        return self.profiler.cycle(name) if self.profiler else nullcontext()
+
     def run_hourly_cycle(self):
         """Run one cycle: post content and check for comments"""
-        logger.info("Starting hourly bot cycle...")
+        with self._profiled('run_hourly_cycle'):
+            logger.info("Starting hourly bot cycle...")
         
-        # Post a random sample post
-        random_post = random.choice(self.sample_posts)
-        success, post_id = self.post_molt(random_post)
+            # Post a random sample post
+            random_post = random.choice(self.sample_posts)
+            success, post_id = self.post_molt(random_post)
         
-        if success:
-            logger.info("Content posted successfully!")
-        else:
-            logger.error("Failed to post content.")
+            if success:
+                logger.info("Content posted successfully!")
+            else:
+                logger.error("Failed to post content.")
         
-        # Check for and respond to comments on existing posts
-        self.check_and_respond_to_comments()
+            # Check for and respond to comments on existing posts
+            self.check_and_respond_to_comments()
         
-        logger.info("Hourly cycle completed.")
+            logger.info("Hourly cycle completed.")
 
-    def run_continuous(self, interval_minutes=60):
-        """Run the bot continuously with specified interval (default 60 minutes)"""
-        logger.info(f"Running continuous bot with {interval_minutes}-minute intervals...")
+    def run_continuous(self, interval_minutes=None, watcher=None, watch_config=True):
+        """Run the bot continuously with specified interval (defaults to POST_INTERVAL_MINUTES from config)"""
+        if watch_config:
+            watcher = watcher or ConfigWatcher()
+        logger.info(f"Running continuous bot with {interval_minutes or self.config.post_interval_minutes}-minute intervals...")
         
         # Check authentication first
         if not self.check_auth():
             logger.error("Failed to authenticate. Exiting.")
             return
         
-        while True:
-            try:
-                self.run_hourly_cycle()
-                
-                logger.info(f"Waiting {interval_minutes} minutes for next cycle...")
-                time.sleep(interval_minutes * 60)
-            except KeyboardInterrupt:
-                logger.info("\nBot stopped by user.")
-                break
-            except Exception as e:
-                logger.error(f"Error in continuous run: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+        try:
+            while True:
+                try:
+                    cycle_started = self.clock.monotonic()
+                    self.run_hourly_cycle()
+                    
+                    # Re-read the interval after every reload so tuning applies to the current wait
+                    while True:
+                        minutes = interval_minutes or self.config.post_interval_minutes
+                        logger.info(f"Waiting {minutes} minutes for next cycle...")
+                        if not self._sleep_until(cycle_started + minutes * 60, watcher):
+                            break
+                except KeyboardInterrupt:
+                    logger.info("\nBot stopped by user.")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in continuous run: {e}")
+                    self.clock.sleep(60)  # Wait a minute before retrying
+        finally:
+            # Spill the most recent post ids to disk, or the next start forgets them
+            self.posted_content_ids.close()
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Enhanced Moltbook human rights bot")
+    parser.add_argument('--continuous', action='store_true', help="keep running, one cycle every POST_INTERVAL_MINUTES")
+    parser.add_argument('--profile', action='store_true', help="profile every Nth cycle (toggle at runtime with SIGUSR1)")
+    parser.add_argument('--profile-dir', default='profiles')
+    parser.add_argument('--profile-every', type=int, default=10, metavar='N')
+    args = parser.parse_args()
+    
     bot = EnhancedMoltbookBot()
     
+    # The profiler is always installed so SIGUSR1 can switch it on later; --profile starts it enabled
+    bot.profiler = CycleProfiler(args.profile_dir, every_n=args.profile_every, enabled=args.profile)
+    bot.profiler.install_signal_toggle()
+    
+    if args.continuous:
+        bot.run_continuous()
+        return
+    
     # Run one cycle to post and check comments
     if bot.check_auth():
-        bot.run_hourly_cycle()
+        try:
+            bot.run_hourly_cycle()
+        finally:
+            bot.posted_content_ids.close()
     else:
         logger.error("Failed to authenticate. Exiting.")
 
@@ -0,0 +1,232 @@
+"""
+Multi-submolt fan-out posting for Moltbook Bot
+
+Each submolt (community) gets its own schedule: a subset of the post templates,
+a cadence, a token bucket enforcing the minimum spacing between posts, and a
+rolling 24-hour quota. Every cycle, all submolts that are due are posted to
+concurrently. A rejection (429) backs off only the submolt that returned it,
+so one throttled community doesn't hold up the others.
+
+Submolts are configured in a JSON file (SUBMOLTS_FILE), e.g.
+
+    {
+        "general": {"cadence_minutes": 60},
+        "privacy": {"templates": [0, 6, 7, 8], "cadence_minutes": 180, "max_posts_per_day": 4},
+        "democracy": {"templates": [1, 2, 3], "cadence_minutes": 240, "min_spacing_minutes": 30}
+    }
+
+where "templates" lists indexes into the post templates (all of them if omitted).
+Without a file, the bot posts to "general" every POST_INTERVAL_MINUTES as before.
+"""
+
+import logging
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+MIN_BACKOFF = 60  # Seconds; floor for the first back-off when a submolt has no minimum spacing
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, now):
+        self.rate = rate  # Tokens per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now):
+        self._refill(now)
+        return self.tokens >= 1
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class SubmoltSchedule:
+    def __init__(self, name, templates, cadence_minutes, max_posts_per_day, min_spacing_minutes):
+        self.name = name
+        self.templates = templates
+        self.cadence = cadence_minutes * 60
+        self.max_posts_per_day = max_posts_per_day
+        self.min_spacing = min_spacing_minutes * 60
+
+        self.bucket = None
+        self.next_due = None
+        self.recent_posts = deque()  # Timestamps of posts in the last 24 hours
+        self.backoff_until = None
+        self.rejections = 0
+
+    def _start(self, now):
+        if self.next_due is None:
+            self.next_due = now
+            self.bucket = TokenBucket(1.0 / max(1, self.min_spacing), 1, now)
+
+    def is_due(self, now):
+        self._start(now)
+        # Allow a little slack so a cycle that starts just before the due time still posts
+        slack = min(60, self.cadence * 0.05)
+        if now + slack < self.next_due:
+            return False
+        return self.can_post(now)
+
+    def can_post(self, now):
+        """Whether spacing, the daily quota and any back-off allow a post right now, regardless of cadence"""
+        self._start(now)
+        if self.backoff_until is not None and now < self.backoff_until:
+            return False
+        while self.recent_posts and now - self.recent_posts[0] >= DAY:
+            self.recent_posts.popleft()
+        if len(self.recent_posts) >= self.max_posts_per_day:
+            return False
+        return self.bucket.available(now)
+
+    def record_success(self, now):
+        self.bucket.take(now)
+        self.recent_posts.append(now)
+        self.rejections = 0
+        self.backoff_until = None
+        # Keep to the cadence grid, but don't try to catch up on slots missed during an outage
+        self.next_due += self.cadence
+        if self.next_due < now:
+            self.next_due = now + self.cadence
+
+    def record_rejection(self, now, retry_after=None):
+        self.rejections += 1
+        if retry_after is None:
+            retry_after = min(6 * 3600, max(MIN_BACKOFF, self.min_spacing) * 2 ** (self.rejections - 1))
+        self.backoff_until = now + retry_after
+
+    def snapshot(self, now):
+        return {
+            'next_due_in_seconds': None if self.next_due is None else max(0.0, self.next_due - now),
+            'posts_last_24h': len(self.recent_posts),
+            'backoff_seconds': 0.0 if self.backoff_until is None else max(0.0, self.backoff_until - now),
+            'rejections': self.rejections,
+        }
+
+
+def load_schedules(config):
+    """Build submolt schedules from the parsed SUBMOLTS_FILE, or a single 'general' schedule"""
+    templates = list(config.post_templates)
+    if not config.submolts:
+        return [SubmoltSchedule('general', templates, config.post_interval_minutes, config.max_posts_per_day, 30)]
+
+    schedules = []
+    for name, options in config.submolts:
+        options = dict(options)
+        indexes = options.get('templates')
+        subset = [templates[i] for i in indexes if 0 <= i < len(templates)] if indexes else templates
+        schedules.append(SubmoltSchedule(
+            name,
+            subset or templates,
+            options.get('cadence_minutes', config.post_interval_minutes),
+            options.get('max_posts_per_day', config.max_posts_per_day),
+            options.get('min_spacing_minutes', 30),
+        ))
+    return schedules
+
+
+class FanoutPoster:
+    def __init__(self, bot, schedules, max_workers=4):
+        self.bot = bot
+        self.schedules = {schedule.name: schedule for schedule in schedules}
+        self.max_workers = max_workers
+        self._lock = threading.Lock()  # Scheduled cycles and control-socket posts share the same budgets
+
+    def configure(self, schedules):
+        """Swap in new schedules, keeping quota and backoff state for submolts that remain"""
+        updated = {}
+        for schedule in schedules:
+            previous = self.schedules.get(schedule.name)
+            if previous is not None:
+                previous.templates = schedule.templates
+                previous.cadence = schedule.cadence
+                previous.max_posts_per_day = schedule.max_posts_per_day
+                previous.min_spacing = schedule.min_spacing
+                if previous.bucket is not None:
+                    previous.bucket.rate = 1.0 / max(1, schedule.min_spacing)
+                schedule = previous
+            updated[schedule.name] = schedule
+        self.schedules = updated
+
+    def _post(self, schedule, content):
+        response = self.bot.submit_post(content, schedule.name)
+        return schedule, response
+
+    def _record(self, schedule, response, now):
+        """Update a submolt's budget from a post response; returns whether the post went through"""
+        if response is not None and response.status_code in (200, 201):
+            schedule.record_success(now)
+            return True
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get('Retry-After') if hasattr(response, 'headers') else None
+            schedule.record_rejection(now, float(retry_after) if retry_after and retry_after.isdigit() else None)
+            logger.warning(f"Submolt {schedule.name} is throttling us, backing off "
+                           f"{schedule.backoff_until - now:.0f}s")
+        return False
+
+    def run_once(self):
+        """Post to every due submolt concurrently; returns the names that were posted to"""
+        with self._lock:
+            return self._run_once()
+
+    def _run_once(self):
+        now = self.bot.clock.time()
+        # In a sharded fleet each submolt is posted to by whichever worker holds its partition
+        due = [schedule for schedule in self.schedules.values()
+               if self.bot.owns(f"submolt:{schedule.name}") and schedule.is_due(now)]
+        if not due:
+            logger.info("No submolts due for a post this cycle")
+            return []
+
+        parent = self.bot.tracer.current()
+
+        def post(schedule):
+            with self.bot.tracer.attach(parent):
+                # One submolt's error mustn't discard the results of the others, which did post
+                try:
+                    return self._post(schedule, random.choice(schedule.templates))
+                except Exception as e:
+                    logger.error(f"Error posting to submolt {schedule.name}: {e}")
+                    return schedule, None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as pool:
+            results = list(pool.map(post, due))
+
+        posted = []
+        now = self.bot.clock.time()
+        for schedule, response in results:
+            if self._record(schedule, response, now):
+                posted.append(schedule.name)
+        logger.info(f"Posted to {len(posted)} of {len(due)} due submolts: {', '.join(posted) or 'none'}")
+        return posted
+
+    def post_now(self, submolt, content=None):
+        """Post to one configured submolt immediately, if its spacing, quota and back-off allow it"""
+        with self._lock:
+            schedule = self.schedules.get(submolt)
+            if schedule is None:
+                raise ValueError(f"Unknown submolt {submolt!r} (configured: {', '.join(self.schedules)})")
+            if not self.bot.owns(f"submolt:{schedule.name}"):
+                return {'posted': False, 'submolt': submolt, 'reason': 'submolt is handled by another worker'}
+            now = self.bot.clock.time()
+            if not schedule.can_post(now):
+                return {'posted': False, 'submolt': submolt, 'reason': 'rate budget exhausted',
+                        **schedule.snapshot(now)}
+            _, response = self._post(schedule, content or random.choice(schedule.templates))
+            posted = self._record(schedule, response, self.bot.clock.time())
+            return {'posted': posted, 'submolt': submolt,
+                    'status_code': None if response is None else response.status_code}
+
+    def snapshot(self):
+        now = self.bot.clock.time()
+        return {name: schedule.snapshot(now) for name, schedule in self.schedules.items()}
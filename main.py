@@ -5,49 +5,45 @@ This bot automates posting on Moltbook (the decentralized social network) every
 and checks for comments on its posts to respond appropriately.
 """
 
-import time
 import random
+import threading
 import requests
 import os
 from datetime import datetime
-from dotenv import load_dotenv
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
 
-# Load environment variables
-load_dotenv()
+from bounded_state import RecentIds
+from checkpoint import SweepCheckpoint
+from circuit_breaker import BreakerRegistry
+from clock import SYSTEM_CLOCK
+from config import ConfigWatcher, load_config
+from control import ControlServer
+from decoding import decode
+from fanout import FanoutPoster, load_schedules
+from profiling import CycleProfiler
+from poll_planner import PollPlanner
+from register import register_with_retry, save_to_keystore
+from shard import LeaseStore, ShardCoordinator
+from thread_index import ThreadIndex
+from tracing import Tracer, traced
+from transport import make_session
+from webhook_listener import CommentEventListener
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class MoltbookBot:
-    def __init__(self):
-        self.username = os.getenv('MOLTBOOK_USERNAME')
-        self.password = os.getenv('MOLTBOOK_PASSWORD')
-        self.api_key = os.getenv('MOLTBOOK_API_KEY')
-        self.base_url = os.getenv('MOLTBOOK_BASE_URL', 'https://www.moltbook.com/api/v1')
-        self.session = requests.Session()
-        
-        # Headers for API requests
-        self.headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'User-Agent': 'MoltbookBot/1.0',
-            'Content-Type': 'application/json'
-        }
-        
-        # Posts about anonymity and democracy as human rights
-        self.sample_posts = [
-            "Anonimity and Democracy should be a Human Right. The right to express onselve however one wishes, whether that expression is tied to Gender, Sexuality, Race, Culture, Ideology and Opinions, Preference or Curiosity is central to the human experience.",
-            "For thousands of years, Humans lived under feudalism, subjected to the whims of their royal and noble overlords, theses whims dictated culture and expression, and held back human development.",
-            "Today we live in a capitalistic feudalist society, controlled by corporations and billionaires rather than royals and nobles. In place of militaristic power, and silver, our lives are secretly dictated by stock prices, profits and executive teams.",
-            "In 2026, this trend has accelerated via the rise of AI and data. Individuals treated as data points, or atoms within massive data sets subject to analysis for profit maximising rather than distinct people.",
-            "Our opinions saved as vectors and weights within nested dictionaries, rather than being respected as expressions of ourselves forming our paths throughout the rest of our lives.",
-            "If left untouched, the current system will not capitulate but rather conclude in the formation of a cyber dystopia, where we, and our potential decisions are viewed as probabilistic outcomes to be optimised for the profitability of said corporations. This is not a conspiracy, this is a certainty.",
-            "Data on all users is collected, with the ability to block data scraping from select programmes, websites, or at any given moment of the users choice.",
-            "Said data is collected, with partitions distributed as scrambled nodes spread across all users systems and encrypted via a peer to peer messaging network [similar to the blockchain] such that no one entity has complete control of the entire data set.",
-            "Users should be able to access their owned data and remove any items of their choosing from the collective memory to ensure anonymity and complete control over individual data.",
-            "Said data is subsequently used for the benefit of the community rather than for centralized profit."
-        ]
+    def __init__(self, config=None, clock=None):
+        self.clock = clock or SYSTEM_CLOCK
+        self.apply_config(config or load_config())
+        self.session = make_session(self.config.http_transport, self.config.fetch_concurrency)
+        self.profiler = None
+        self.tracer = Tracer(self.config.trace_file)
         
         # Responses for comments to encourage engagement
         self.comment_responses = [
@@ -60,7 +56,104 @@ class MoltbookBot:
             "Your input adds depth to this critical conversation about digital rights.",
             "Thank you for joining this important dialogue about democracy and technology."
         ]
+        
+        # Comments we've already answered, shared by the sweep and push-mode workers
+        self.replied_comment_ids = RecentIds(
+            os.path.join(self.config.state_dir, 'replied_comment_ids.sqlite3'),
+            capacity=self.config.recent_ids_capacity
+        )
+        self._replied_lock = threading.Lock()
+        self._sweep_lock = threading.Lock()  # One comment sweep at a time (scheduled or via the control socket)
+        
+        # Sweep progress, so a crash or restart mid-sweep only costs the unfinished remainder
+        self.sweep_checkpoint = SweepCheckpoint(
+            os.path.join(self.config.state_dir, 'sweep_checkpoint.json'),
+            interval=self.config.sweep_checkpoint_seconds,
+            max_age=self.config.post_interval_minutes * 60,
+            clock=self.clock
+        )
+        
+        # Per-post polling schedule so quiet posts aren't fetched every cycle
+        self.poll_planner = PollPlanner(
+            min_interval=self.config.poll_min_interval_minutes * 60,
+            max_interval=self.config.poll_max_interval_minutes * 60
+        )
+
+    def apply_config(self, config):
+        """Switch the bot to a new config; safe to call between cycles of a running bot"""
+        # Build everything that can fail before touching the bot, so a bad config is never half-applied
+        schedules = load_schedules(config)
+        self.config = config
+        self.username = config.username
+        self.password = config.password
+        # A new key or endpoint may belong to a different agent
+        if getattr(self, 'api_key', None) != config.api_key or getattr(self, 'base_url', None) != config.base_url:
+            self.agent_id = None
+            self.agent_name = None
+        self.api_key = config.api_key
+        self.base_url = config.base_url
+        
+        # Headers for API requests
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'User-Agent': 'MoltbookBot/1.0',
+            'Content-Type': 'application/json'
+        }
+        
+        # Per-route circuit breakers so a dead endpoint is skipped instead of retried on every call
+        if hasattr(self, 'breakers'):
+            self.breakers.configure(config.breaker_failure_threshold, config.breaker_cooldown_seconds)
+        else:
+            self.breakers = BreakerRegistry(config.breaker_failure_threshold, config.breaker_cooldown_seconds, clock=self.clock.monotonic)
+        
+        # Per-submolt posting schedules, rate buckets and quotas
+        if hasattr(self, 'fanout'):
+            self.fanout.configure(schedules)
+        else:
+            self.fanout = FanoutPoster(self, schedules)
+        
+        # Sharded fleet membership is fixed for the life of the process
+        if not hasattr(self, 'shard'):
+            self.shard = None
+            if config.shard_store:
+                self.shard = ShardCoordinator(LeaseStore(config.shard_store), config.worker_id,
+                                              config.shard_partitions, config.shard_lease_seconds, clock=self.clock)
+        
+        if hasattr(self, 'poll_planner'):
+            self.poll_planner.min_interval = config.poll_min_interval_minutes * 60
+            self.poll_planner.max_interval = config.poll_max_interval_minutes * 60
+        if hasattr(self, 'sweep_checkpoint'):
+            self.sweep_checkpoint.interval = config.sweep_checkpoint_seconds
+            self.sweep_checkpoint.max_age = config.post_interval_minutes * 60
+
+    @property
+    def own_name(self):
+        """The name our comments appear under: the agent's profile name once known, else MOLTBOOK_USERNAME"""
+        return self.agent_name or self.username
 
+    def reload_config(self, watcher):
+        """Apply the latest config if the watched files changed; returns True when it did"""
+        config = watcher.poll()
+        if config is None:
+            return False
+        logger.info("Configuration changed on disk, applying new settings")
+        self.apply_config(config)
+        return True
+
+    def _sleep_until(self, deadline, watcher=None, tick_seconds=5):
+        """Sleep until a monotonic deadline, applying config changes as they land"""
+        while True:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                return False
+            if watcher is None:
+                self.clock.sleep(remaining)
+                return False
+            self.clock.sleep(min(remaining, tick_seconds))
+            if self.reload_config(watcher):
+                return True
+
+    @traced()
     def check_auth(self):
         """Check if API key is valid by getting agent info"""
         logger.info("Checking Moltbook API authentication...")
@@ -73,8 +166,10 @@ class MoltbookBot:
             
             if response.status_code == 200:
                 logger.info("Successfully authenticated with Moltbook API!")
-                agent_info = response.json()
-                logger.info(f"Authenticated as: {agent_info.get('agent', {}).get('name', 'Unknown')}")
+                agent_info = decode('GET /agents/me', response.content)
+                self.agent_id = agent_info.get('id')
+                self.agent_name = agent_info.get('name')
+                logger.info(f"Authenticated as: {agent_info.get('name', 'Unknown')}")
                 return True
             else:
                 logger.error(f"Authentication failed with status {response.status_code}")
@@ -84,282 +179,608 @@ class MoltbookBot:
             logger.error(f"Error during authentication check: {e}")
             return False
 
-    def post_molt(self, content):
-        """Post a new molt (post) to Moltbook"""
-        logger.info(f"Posting: {content[:50]}...")
-        
+    @traced('submolt')
+    def submit_post(self, content, submolt='general'):
+        """Send a post to one submolt and return the raw response (None if the route was skipped)"""
         # Create a post with title and content
         post_data = {
-            'submolt': 'general',  # Default submolt
+            'submolt': submolt,
             'title': content[:100] if len(content) > 100 else content,  # Use content as title (truncated)
             'content': content
         }
         
-        try:
-            response = self.session.post(
-                f"{self.base_url}/posts",
-                json=post_data,
-                headers=self.headers
-            )
-            
-            if response.status_code == 200 or response.status_code == 201:
-                logger.info("Successfully posted to Moltbook!")
-                return True
-            else:
-                logger.error(f"Failed to post, status: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                return False
-        except Exception as e:
-            logger.error(f"Error posting molt: {e}")
-            return False
+        # Each submolt gets its own breaker so one throttling community doesn't block the rest
+        return self._request('POST', f'POST /posts [{submolt}]', f"{self.base_url}/posts", json=post_data)
+
+    def _request(self, method, route, url, **kwargs):
+        """Send a request through the route's circuit breaker; returns None if it was skipped or failed to connect"""
+        breaker = self.breakers.get(route)
+        if not breaker.allow():
+            logger.debug(f"Circuit open for {route}, skipping request")
+            self.tracer.current().set_attribute(f"skipped.{route}", True)
+            return None
+        
+        with self.tracer.span('http', method=method, route=route) as span:
+            try:
+                response = self.session.request(method, url, headers=self.headers, **kwargs)
+                span.set_attribute('status', response.status_code)
+                if self.tracer.enabled:
+                    span.set_attribute('bytes', len(response.content))
+            except requests.RequestException as e:
+                logger.warning(f"Request to {route} failed: {e}")
+                breaker.record_failure()
+                span.set_status(False)
+                return None
+            except BaseException:
+                # Whatever else escapes (e.g. an httpx error the HTTP/2 session doesn't translate) must still
+                # settle the breaker, or a half-open probe would stay in flight and the route be skipped for good
+                breaker.record_failure()
+                raise
+        
+        # Server errors and missing routes count against the route; other 4xx are the caller's problem.
+        # On a per-item route (an {id} in the path or an id in the query) a 404 may only mean that one item
+        # is gone, so it counts once several different items are missing. A 429 is throttling, not an outage.
+        per_item = '{id}' in route or '?' in route
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After') if hasattr(response, 'headers') else None
+            breaker.record_throttled(float(retry_after) if retry_after and retry_after.isdigit() else None)
+        elif response.status_code == 404 and per_item:
+            breaker.record_not_found(url)
+        elif response.status_code >= 500 or response.status_code in (404, 405):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _should_fall_back(self, route, response):
+        """Whether a failed call is worth retrying on an alternative route (not when we're just being rate limited)"""
+        if response is None:
+            return not self.breakers.get(route).throttled()
+        return response.status_code != 429
+
+    def health(self):
+        """Snapshot of the bot's state for status and health output"""
+        return {
+            'username': self.username,
+            'base_url': self.base_url,
+            'tracked_posts': len(self.poll_planner.posts),
+            'circuit_breakers': self.breakers.snapshot(),
+            'submolts': self.fanout.snapshot(),
+            'shard': self.shard.snapshot() if self.shard else None,
+        }
 
+    def owns(self, key):
+        """Whether this process handles a post id or submolt (always, unless it is part of a sharded fleet)"""
+        return self.shard is None or self.shard.owns(key)
+
+    def handle_command(self, command, args):
+        """Run a control-socket command (see control.py) inside this warm process"""
+        if command == 'status':
+            return self.health()
+        if command == 'post':
+            return self.fanout.post_now(args.get('submolt', 'general'), args.get('content'))
+        if command == 'sweep':
+            return {'replies': self.check_and_respond_to_comments()}
+        if command == 'register':
+            # Register against the API this bot is configured for, not the production default
+            record = register_with_retry(self.session, args['name'], args['description'],
+                                         url=f"{self.base_url}/agents/register")
+            if record.get('error'):
+                raise RuntimeError(record['error'])
+            # The key goes to the keystore, not back over the socket
+            keystore = args.get('keystore', 'keystore.json')
+            save_to_keystore(keystore, [record])
+            return {'name': record['name'], 'claim_url': record['claim_url'],
+                    'verification_code': record['verification_code'], 'keystore': keystore}
+        raise ValueError(f"Unknown command {command!r}")
+
+    def _start_control_socket(self):
+        """Accept control commands on CONTROL_SOCKET if it is set; returns the server to stop later"""
+        if not self.config.control_socket:
+            return None
+        control = ControlServer(self.config.control_socket, self.handle_command)
+        control.start()
+        return control
+
+    @traced()
     def get_my_posts(self):
         """Get the bot's recent posts to check for comments"""
         try:
-            # Get the authenticated user's profile to find their posts
-            response = self.session.get(
-                f"{self.base_url}/agents/me",
-                headers=self.headers
+            # The agent id is cached by check_auth, so the profile is only fetched when it's missing
+            user_id = self.agent_id
+            if not user_id:
+                response = self._request('GET', 'GET /agents/me', f"{self.base_url}/agents/me")
+                if response is None or response.status_code != 200:
+                    if response is not None:
+                        logger.warning(f"Failed to get user info, status: {response.status_code}")
+                        logger.warning(f"Response: {response.text}")
+                    return []
+                agent_info = decode('GET /agents/me', response.content)
+                user_id = self.agent_id = agent_info.get('id')
+                self.agent_name = agent_info.get('name')
+            
+            if not user_id:
+                logger.warning("Could not find user ID")
+                return []
+            
+            # Get posts by this user - use the correct endpoint format
+            posts_response = self._request(
+                'GET', 'GET /posts?author_id',
+                f"{self.base_url}/posts",
+                params={'author_id': user_id}
             )
             
-            if response.status_code == 200:
-                user_info = response.json()
-                user_id = user_info.get('agent', {}).get('id')
-                
-                if user_id:
-                    # Get posts by this user - use the correct endpoint format
-                    posts_response = self.session.get(
-                        f"{self.base_url}/posts",
-                        headers=self.headers,
-                        params={'author_id': user_id}
-                    )
-                    
-                    if posts_response.status_code == 200:
-                        posts_data = posts_response.json()
-                        # Handle response format - could be a dict with posts array or just the array
-                        if isinstance(posts_data, dict):
-                            posts = posts_data.get('posts', [])  # Handle common API response format
-                        elif isinstance(posts_data, list):
-                            posts = posts_data  # If it's already a list
-                        else:
-                            posts = []
-                        return posts
-                    else:
-                        logger.warning(f"Failed to get user posts with author_id param, status: {posts_response.status_code}")
-                        logger.warning(f"Response: {posts_response.text}")
-                        
-                        # Try alternative approach - get user's posts directly
-                        alt_response = self.session.get(
-                            f"{self.base_url}/agents/{user_id}/posts",
-                            headers=self.headers
-                        )
-                        
-                        if alt_response.status_code == 200:
-                            posts_data = alt_response.json()
-                            if isinstance(posts_data, dict):
-                                posts = posts_data.get('posts', [])
-                            elif isinstance(posts_data, list):
-                                posts = posts_data
-                            else:
-                                posts = []
-                            return posts
-                        else:
-                            logger.warning(f"Alternative method also failed: {alt_response.status_code}")
-                            return []
-                else:
-                    logger.warning("Could not find user ID")
-                    return []
-            else:
-                logger.warning(f"Failed to get user info, status: {response.status_code}")
-                logger.warning(f"Response: {response.text}")
+            if posts_response is not None and posts_response.status_code == 200:
+                # Handles both {'posts': [...]} and a bare array
+                return decode('GET /posts?author_id', posts_response.content)
+            if not self._should_fall_back('GET /posts?author_id', posts_response):
+                logger.warning("Rate limited listing my posts")
                 return []
+            
+            if posts_response is not None:
+                logger.warning(f"Failed to get user posts with author_id param, status: {posts_response.status_code}")
+                logger.warning(f"Response: {posts_response.text}")
+            
+            # Try alternative approach - get user's posts directly
+            alt_response = self._request('GET', 'GET /agents/{id}/posts', f"{self.base_url}/agents/{user_id}/posts")
+            
+            if alt_response is not None and alt_response.status_code == 200:
+                return decode('GET /agents/{id}/posts', alt_response.content)
+            logger.warning(f"Alternative method also failed: {alt_response.status_code if alt_response is not None else 'skipped'}")
+            return []
         except Exception as e:
             logger.error(f"Error getting my posts: {e}")
             return []
 
+    @traced('post_id')
     def get_comments_for_post(self, post_id):
-        """Get comments for a specific post"""
+        """Get comments for a specific post, or None if they couldn't be fetched (as opposed to [] for none)"""
         try:
             # Try different endpoint formats for getting comments
             endpoints_to_try = [
-                f"{self.base_url}/posts/{post_id}/comments",
-                f"{self.base_url}/comments?post_id={post_id}",
-                f"{self.base_url}/posts/{post_id}?include=comments",
+                ('GET /posts/{id}/comments', f"{self.base_url}/posts/{post_id}/comments"),
+                ('GET /comments?post_id', f"{self.base_url}/comments?post_id={post_id}"),
+                ('GET /posts/{id}?include=comments', f"{self.base_url}/posts/{post_id}?include=comments"),
             ]
             
-            for endpoint in endpoints_to_try:
-                response = self.session.get(endpoint, headers=self.headers)
+            for route, endpoint in endpoints_to_try:
+                response = self._request('GET', route, endpoint)
                 
-                if response.status_code == 200:
-                    comments = response.json()
-                    # Handle different response formats
-                    if isinstance(comments, dict):
-                        # Check if comments are in a 'comments' field
-                        if 'comments' in comments:
-                            return comments['comments']
-                        # Or if the whole response is comment data
-                        else:
-                            return [comments] if comments else []
-                    elif isinstance(comments, list):
-                        return comments
-                    else:
-                        return []
-                elif response.status_code in [200, 201, 204]:  # Different success codes
-                    comments = response.json()
-                    if isinstance(comments, dict) and 'comments' in comments:
-                        return comments['comments']
-                    elif isinstance(comments, list):
-                        return comments
-                    else:
-                        return []
+                # Handles {'comments': [...]}, a bare array or a single comment object
+                if response is not None and response.status_code in (200, 201, 204):
+                    return decode(route, response.content)
+                if not self._should_fall_back(route, response):
+                    logger.warning(f"Rate limited fetching comments for post {post_id}")
+                    break
             
             logger.warning(f"Failed to get comments for post {post_id}, tried multiple endpoints")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Error getting comments for post {post_id}: {e}")
-            return []
+            return None
 
-    def post_comment(self, post_id, comment_text):
-        """Post a comment on a specific post"""
+    @traced('post_id')
+    def post_comment(self, post_id, comment_text, parent_id=None):
+        """Post a comment on a specific post, as a reply to `parent_id` when given"""
         try:
             comment_data = {
                 'content': comment_text
             }
+            if parent_id:
+                comment_data['parent_id'] = parent_id
             
             # Try the standard endpoint first
-            response = self.session.post(
+            response = self._request(
+                'POST', 'POST /posts/{id}/comments',
                 f"{self.base_url}/posts/{post_id}/comments",
-                json=comment_data,
-                headers=self.headers
+                json=comment_data
             )
             
-            if response.status_code in [200, 201]:
+            if response is not None and response.status_code in [200, 201]:
                 logger.info(f"Successfully commented on post {post_id}")
                 return True
+            elif not self._should_fall_back('POST /posts/{id}/comments', response):
+                logger.warning(f"Rate limited commenting on post {post_id}, not trying the alternative endpoint")
+                return False
             else:
-                logger.error(f"Failed to comment on post {post_id}, status: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                if response is not None:
+                    logger.error(f"Failed to comment on post {post_id}, status: {response.status_code}")
+                    logger.error(f"Response: {response.text}")
                 
                 # Try alternative endpoint format
-                alt_response = self.session.post(
+                alt_response = self._request(
+                    'POST', 'POST /comments',
                     f"{self.base_url}/comments",
                     json={
                         'post_id': post_id,
-                        'content': comment_text
-                    },
-                    headers=self.headers
+                        **comment_data
+                    }
                 )
                 
-                if alt_response.status_code in [200, 201]:
+                if alt_response is not None and alt_response.status_code in [200, 201]:
                     logger.info(f"Successfully commented on post {post_id} using alternative endpoint")
                     return True
                 else:
-                    logger.error(f"Alternative comment endpoint also failed: {alt_response.status_code}")
+                    logger.error(f"Alternative comment endpoint also failed: {alt_response.status_code if alt_response is not None else 'skipped'}")
                     return False
         except Exception as e:
             logger.error(f"Error posting comment: {e}")
             return False
 
-    def check_and_respond_to_comments(self):
-        """Check all of the bot's posts for comments and respond appropriately"""
-        logger.info("Checking for comments on my posts...")
-        
-        # Get the bot's posts
-        my_posts = self.get_my_posts()
-        
-        if not my_posts:
-            logger.info("No posts found or error retrieving posts")
-            return
+    @traced()
+    def check_and_respond_to_comments(self, list_posts=True):
+        """Check all of the bot's posts for comments and respond appropriately; returns the number of replies posted
+
+        With list_posts=False, only the posts already tracked from an earlier listing are checked.
+        """
+        with self._sweep_lock:
+            logger.info("Checking for comments on my posts...")
         
-        # Process each post to check for comments
-        for post in my_posts:
-            post_id = post.get('id') or post.get('post', {}).get('id')
-            if not post_id:
-                continue
-                
-            # Get comments for this post
-            comments = self.get_comments_for_post(post_id)
+            if list_posts:
+                # Get the bot's posts
+                my_posts = self.get_my_posts()
             
-            if not comments:
-                continue
+                if not my_posts:
+                    logger.info("No posts found or error retrieving posts")
+                    return 0
             
-            logger.info(f"Found {len(comments)} comments for post {post_id}")
+                # In a sharded fleet, only sweep the posts in partitions this worker holds
+                if self.shard:
+                    my_posts = [post for post in my_posts if self.owns(post.get('id') or post.get('post', {}).get('id'))]
+                
+                self.poll_planner.track(my_posts, self.clock.time())
             
-            # Limit the number of comments to respond to in one cycle to prevent rate limiting
-            comments_to_respond = min(len(comments), 5)  # Only respond to first 5 comments
+            # Only poll the posts whose adaptive schedule says they're due
+            due_posts = self.poll_planner.pop_due(self.clock.time())
+            logger.info(f"{len(due_posts)} of {len(self.poll_planner.posts)} posts due for a comment check")
+            sweep, thread = self._resume_sweep(due_posts)
+        
+            replies = 0
+            try:
+                # Replies still owed from an interrupted sweep go out first
+                replies += self._send_pending_replies(sweep, thread)
             
-            # Look for new comments that aren't from the bot itself
-            for i, comment in enumerate(comments[:comments_to_respond]):
-                comment_id = comment.get('id')
-                comment_author = comment.get('author', {}).get('name', 'Unknown')
-                comment_content = comment.get('content', '')
-                
-                # Skip if the comment is from the bot itself
-                if comment_author == self.username:
-                    continue
-                
-                # Check if we've already responded to this comment
-                # (In a real implementation, we'd track this in a database)
-                
-                # Respond to the comment with a relevant response
-                response_text = random.choice(self.comment_responses)
-                logger.info(f"Responding to comment from {comment_author} on post {post_id}")
+                # Fetch comments for the due posts (concurrently if FETCH_CONCURRENCY > 1), replying in post order
+                for post_id, comments in self._fetch_comments(sweep['posts'][sweep['cursor']:]):
+                    sweep['cursor'] += 1
+                    if comments is None:
+                        # A failed fetch says nothing about activity: keep the post's interval and stats as they were
+                        self.poll_planner.defer(post_id, self.clock.time())
+                        continue
                 
-                success = self.post_comment(post_id, response_text)
-                if success:
-                    logger.info("Successfully responded to comment")
-                else:
-                    logger.error("Failed to respond to comment")
+                    own, unanswered = (), 0
+                    if comments:
+                        # Index the thread once so our own comments, answered comments and replies to us are set lookups
+                        thread = ThreadIndex(comments, self.own_name)
+                        # Drop comments we already replied to but whose reply isn't in the fetched thread yet,
+                        # so they don't use up this post's slots
+                        pending = [comment for comment in thread.unanswered()
+                                   if comment['id'] not in self.replied_comment_ids]
+                        logger.info(f"Found {len(thread)} comments for post {post_id}, {len(pending)} unanswered "
+                                    f"({len(thread.replies_to_us())} replying to us)")
                     
-                # Add a small delay to avoid rate limiting
-                time.sleep(2)
+                        # Limit the number of comments to respond to in one cycle to prevent rate limiting
+                        sweep['pending'] = [{'post_id': post_id, 'comment': comment} for comment in pending[:5]]
+                        sent = self._send_pending_replies(sweep, thread)
+                        replies += sent
+                        own, unanswered = thread.own, len(pending) - sent
+                    # Scheduled after replying, so comments still owed keep the post on the shortest interval
+                    self.poll_planner.record(post_id, comments, self.clock.time(), own=own, unanswered=unanswered)
+                    self.sweep_checkpoint.save(sweep)
+            except BaseException:
+                # Keep the progress so the retry (or the next process) resumes here instead of starting over
+                self.sweep_checkpoint.save(sweep, force=True)
+                raise
+            self.sweep_checkpoint.clear()
+            return replies
 
-    def run_hourly_cycle(self):
-        """Run one cycle: post content and check for comments"""
-        logger.info("Starting hourly bot cycle...")
+    def _resume_sweep(self, due_posts):
+        """Plan a sweep over `due_posts`, picking up where an interrupted sweep left off"""
+        sweep = {'posts': due_posts, 'cursor': 0, 'pending': []}
+        saved = self.sweep_checkpoint.load()
+        if saved is None:
+            return sweep, None
+
+        done = set(saved['posts'][:saved['cursor']])
+        due = set(due_posts)
+        remaining = [post_id for post_id in saved['posts'][saved['cursor']:] if post_id in due]
+        # Posts the interrupted sweep already checked wait for their next poll instead of being fetched again
+        for post_id in done & due:
+            self.poll_planner.defer(post_id, self.clock.time())
+        leftover = done.union(remaining)
+        sweep['posts'] = remaining + [post_id for post_id in due_posts if post_id not in leftover]
+        sweep['pending'] = [task for task in saved['pending'] if task['post_id'] in self.poll_planner.posts]
+        logger.info(f"Resuming interrupted sweep: {len(done & due)} posts already checked, {len(remaining)} left "
+                    f"over, {len(sweep['pending'])} replies pending")
+        
+        # A reply may have gone out just before the interruption, so re-read that one thread before replaying
+        thread = None
+        if sweep['pending']:
+            comments = self.get_comments_for_post(sweep['pending'][0]['post_id'])
+            if comments is None:
+                # Can't tell which replies already went out, so leave the post for its next poll
+                logger.warning("Couldn't re-read the interrupted thread, dropping its pending replies")
+                sweep['pending'] = []
+            else:
+                thread = ThreadIndex(comments, self.own_name)
+        return sweep, thread
+
+    def _send_pending_replies(self, sweep, thread):
+        """Work through the sweep's pending reply tasks, checkpointing as each one completes"""
+        replies = 0
+        while sweep['pending']:
+            task = sweep['pending'][0]
+            replied = self.reply_to_comment(task['post_id'], task['comment'], thread)
+            sweep['pending'].pop(0)
+            replies += bool(replied)
+            self.sweep_checkpoint.save(sweep)
+            
+            # Add a small delay to avoid rate limiting
+            if replied is not None:
+                with self.tracer.span('sleep', seconds=2):
+                    self.clock.sleep(2)
+        return replies
+
+    def _fetch_comments(self, post_ids):
+        """Yield (post_id, comments) in order, fetching at most FETCH_CONCURRENCY posts ahead of the caller"""
+        workers = min(self.config.fetch_concurrency, len(post_ids))
+        if workers <= 1:
+            for post_id in post_ids:
+                yield post_id, self.get_comments_for_post(post_id)
+            return
+        # Tracer stacks are per thread: hand the sweep's span to the workers so fetches nest under it
+        parent = self.tracer.current()
+
+        def fetch(post_id):
+            with self.tracer.attach(parent):
+                return self.get_comments_for_post(post_id)
+
+        # Submit the next fetch only as each result is handed out, so fetching runs at most `workers` posts
+        # ahead of the replies: comment lists aren't all held at once, and none goes stale waiting its turn
+        remaining = iter(post_ids)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            window = deque((post_id, pool.submit(fetch, post_id)) for post_id in islice(remaining, workers))
+            while window:
+                post_id, future = window.popleft()
+                for next_id in islice(remaining, 1):
+                    window.append((next_id, pool.submit(fetch, next_id)))
+                yield post_id, future.result()
+
+    @traced('post_id')
+    def reply_to_comment(self, post_id, comment, thread=None):
+        """Reply to one comment in-thread; returns None if skipped, otherwise whether the reply was posted"""
+        comment_id = comment.get('id')
+        comment_author = comment.get('author', {}).get('name', 'Unknown')
+        
+        # Skip if the comment is from the bot itself
+        if self.own_name and comment_author == self.own_name:
+            return None
+        
+        # Claim the comment so the sweep and push workers never answer it twice
+        with self._replied_lock:
+            if comment_id and comment_id in self.replied_comment_ids:
+                return None
+            if comment_id:
+                self.replied_comment_ids.add(comment_id)
         
-        # Post a random sample post (but skip if rate limited)
-        random_post = random.choice(self.sample_posts)
-        success = self.post_molt(random_post)
+        # Already answered in the thread (e.g. before our local state was lost): keep the claim, don't reply again
+        if thread is not None and thread.is_answered(comment_id):
+            return None
         
+        # Other workers in the fleet may have seen the same comment (e.g. just after a lease moved)
+        if self.shard and comment_id and not self.shard.claim_reply(comment_id):
+            return None
+        
+        # Respond to the comment with a relevant response
+        response_text = random.choice(self.comment_responses)
+        logger.info(f"Responding to comment from {comment_author} on post {post_id}")
+        
+        success = self.post_comment(post_id, response_text, parent_id=comment_id)
         if success:
-            logger.info("Content posted successfully!")
+            logger.info("Successfully responded to comment")
         else:
-            logger.info("Could not post content (possibly due to rate limiting). Continuing to check comments.")
+            logger.error("Failed to respond to comment")
+            # Release the claim so a later event or sweep can retry it
+            with self._replied_lock:
+                self.replied_comment_ids.discard(comment_id)
+            if self.shard and comment_id:
+                self.shard.unclaim_reply(comment_id)
+        return success
+
+    def _profiled(self, name):
+        """Context that profiles a cycle when a profiler is attached (see profiling.py)"""
+        return self.profiler.cycle(name) if self.profiler else nullcontext()
+
+    @traced()
+    def run_hourly_cycle(self):
+        """Run one cycle: post content and check for comments"""
+        with self._profiled('run_hourly_cycle'):
+            logger.info("Starting hourly bot cycle...")
+        
+            # Post to every submolt that is due (but skip ones that are rate limited)
+            try:
+                posted = self.fanout.run_once()
+            except Exception as e:
+                logger.error(f"Error during fan-out posting: {e}")
+                posted = []
         
-        # Check for and respond to comments on existing posts
-        self.check_and_respond_to_comments()
+            if posted:
+                logger.info("Content posted successfully!")
+            else:
+                logger.info("Could not post content (none due or rate limited). Continuing to check comments.")
+        
+            # Check for and respond to comments on existing posts
+            self.check_and_respond_to_comments()
         
-        logger.info("Hourly cycle completed.")
+            open_routes = [route for route, state in self.breakers.snapshot().items() if state['state'] != 'closed']
+            if open_routes:
+                logger.warning(f"Circuit breakers not closed: {', '.join(open_routes)}")
+            logger.info("Hourly cycle completed.")
 
-    def run_continuous(self, interval_minutes=60):
-        """Run the bot continuously with specified interval (default 60 minutes)"""
-        logger.info(f"Running continuous bot with {interval_minutes}-minute intervals...")
+    def _wait_for_cycle(self, deadline, watcher=None):
+        """Sleep until the next cycle's monotonic deadline, sweeping comments whenever polled posts fall due first;
+        returns True if the config was reloaded meanwhile"""
+        while True:
+            due_in = self.poll_planner.next_due_in(self.clock.time())
+            if due_in is None or self.clock.monotonic() + due_in >= deadline:
+                return self._sleep_until(deadline, watcher)
+            # Hot posts are due every POLL_MIN_INTERVAL_MINUTES, not once a cycle. The floor batches posts that
+            # fall due close together into one sweep
+            if self._sleep_until(self.clock.monotonic() + max(due_in, 60), watcher):
+                return True
+            try:
+                # The cycle's listing is recent enough: just check the tracked posts that are due
+                with self._profiled('comment_sweep'):
+                    self.check_and_respond_to_comments(list_posts=False)
+            except Exception as e:
+                logger.error(f"Error during comment sweep: {e}")
+
+    def run_continuous(self, interval_minutes=None, watcher=None, watch_config=True):
+        """Run the bot continuously with specified interval (defaults to POST_INTERVAL_MINUTES from config)"""
+        if watch_config:
+            watcher = watcher or ConfigWatcher()
+        logger.info(f"Running continuous bot with {interval_minutes or self.config.post_interval_minutes}-minute intervals...")
         
         # Check authentication first
         if not self.check_auth():
             logger.error("Failed to authenticate. Exiting.")
             return
         
+        if self.shard:
+            self.shard.start()
+        control = self._start_control_socket()
+        try:
+            while True:
+                try:
+                    cycle_started = self.clock.monotonic()
+                    self.run_hourly_cycle()
+                
+                    # Re-read the interval after every reload so tuning applies to the current wait
+                    while True:
+                        minutes = interval_minutes or self.config.post_interval_minutes
+                        logger.info(f"Waiting {minutes} minutes for next cycle...")
+                        if not self._wait_for_cycle(cycle_started + minutes * 60, watcher):
+                            break
+                except KeyboardInterrupt:
+                    logger.info("\nBot stopped by user.")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in continuous run: {e}")
+                    self.clock.sleep(60)  # Wait a minute before retrying
+        finally:
+            if control:
+                control.stop()
+            if self.shard:
+                self.shard.stop()
+            # Spill the most recent replied ids to disk, or the next start forgets them
+            self.replied_comment_ids.close()
+
+    def _reply_worker(self, events):
+        """Consume pushed comment events and reply to them"""
         while True:
+            event = events.get()
             try:
-                self.run_hourly_cycle()
-                
-                logger.info(f"Waiting {interval_minutes} minutes for next cycle...")
-                time.sleep(interval_minutes * 60)
-            except KeyboardInterrupt:
-                logger.info("\nBot stopped by user.")
-                break
+                # The listener takes events from any local process: only answer on posts we're tracking
+                post_id = event['post_id']
+                if post_id not in self.poll_planner.posts or not self.owns(post_id):
+                    logger.warning(f"Ignoring pushed comment event for post {post_id}, which isn't one of ours")
+                    continue
+                replied = self.reply_to_comment(post_id, event['comment'])
+                if replied is not None:
+                    self.clock.sleep(2)
             except Exception as e:
-                logger.error(f"Error in continuous run: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+                logger.error(f"Error handling pushed comment event: {e}")
+            finally:
+                events.task_done()
+
+    def run_push_mode(self, workers=2, watcher=None):
+        """Reply to comments pushed to a local listener, with a slow reconciliation poll as a safety net"""
+        watcher = watcher or ConfigWatcher()
+        logger.info(f"Running push-mode bot (posting every {self.config.post_interval_minutes} minutes, reconciling every {self.config.reconcile_interval_minutes} minutes)...")
+        
+        if not self.check_auth():
+            logger.error("Failed to authenticate. Exiting.")
+            return
+        
+        listener = CommentEventListener(self.config.webhook_host, self.config.webhook_port, token=self.config.webhook_token)
+        listener.start()
+        if self.shard:
+            self.shard.start()
+        control = self._start_control_socket()
+        for n in range(workers):
+            threading.Thread(target=self._reply_worker, args=(listener.events,), name=f'reply-worker-{n}', daemon=True).start()
+        
+        # Reconcile once on start-up so nothing posted while we were down is missed
+        last_post = None
+        last_reconcile = None
+        try:
+            while True:
+                try:
+                    now = self.clock.monotonic()
+                    if last_post is None or now >= last_post + self.config.post_interval_minutes * 60:
+                        if self.fanout.run_once():
+                            # Reconcile now so the new posts are tracked and events for them are accepted
+                            last_reconcile = None
+                        last_post = now
+                    if last_reconcile is None or now >= last_reconcile + self.config.reconcile_interval_minutes * 60:
+                        with self._profiled('reconcile'):
+                            self.check_and_respond_to_comments()
+                        last_reconcile = now
+                    self._sleep_until(min(
+                        last_post + self.config.post_interval_minutes * 60,
+                        last_reconcile + self.config.reconcile_interval_minutes * 60
+                    ), watcher)
+                except KeyboardInterrupt:
+                    raise
+                except Exception as e:
+                    # Keep the listener and reply workers up; whatever failed is retried after the pause
+                    logger.error(f"Error in push-mode loop: {e}")
+                    self.clock.sleep(60)  # Wait a minute before retrying
+        except KeyboardInterrupt:
+            logger.info("\nBot stopped by user.")
+        finally:
+            listener.stop()
+            if control:
+                control.stop()
+            if self.shard:
+                self.shard.stop()
+            self.replied_comment_ids.close()
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Moltbook human rights bot")
+    parser.add_argument('--push', action='store_true', help="run in push-ingestion mode with a local webhook listener")
+    parser.add_argument('--continuous', action='store_true', help="keep running, one cycle every POST_INTERVAL_MINUTES")
+    parser.add_argument('--profile', action='store_true', help="profile every Nth cycle (toggle at runtime with SIGUSR1)")
+    parser.add_argument('--profile-dir', default='profiles')
+    parser.add_argument('--profile-every', type=int, default=10, metavar='N')
+    args = parser.parse_args()
+    
     bot = MoltbookBot()
     
+    # The profiler is always installed so SIGUSR1 can switch it on later; --profile starts it enabled
+    bot.profiler = CycleProfiler(args.profile_dir, every_n=args.profile_every, enabled=args.profile)
+    bot.profiler.install_signal_toggle()
+    
+    if args.push:
+        bot.run_push_mode()
+        return
+    
+    if args.continuous:
+        bot.run_continuous()
+        return
+    
     # Run one cycle to post and check comments
     if bot.check_auth():
-        bot.run_hourly_cycle()
+        if bot.shard:
+            bot.shard.start()
+        try:
+            bot.run_hourly_cycle()
+        finally:
+            if bot.shard:
+                bot.shard.stop()
+            bot.replied_comment_ids.close()
     else:
         logger.error("Failed to authenticate. Exiting.")
 
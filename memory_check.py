@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory regression check for long-running bots
+
+Drives the bot's per-cycle bookkeeping (post tracking, adaptive polling, reply
+de-duplication) against an in-process stand-in session for many cycles and uses
+tracemalloc to measure how much memory each cycle retains. Exits non-zero if
+retained memory keeps growing, so it can gate a build.
+"""
+
+import argparse
+import logging
+import resource
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import replace
+
+from config import load_config
+from main import MoltbookBot
+
+
+class _Response:
+    status_code = 201
+    text = '{}'
+    content = b'{}'
+
+    def json(self):
+        return {}
+
+
+class StandInSession:
+    """Accepts every comment without touching the network"""
+
+    def request(self, method, url, **kwargs):
+        return _Response()
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def run_cycle(bot, cycle, posts, comments_per_cycle):
+    """One sweep: every due post gets a batch of brand new comments to answer; returns the replies posted"""
+    replies = 0
+    now = cycle * 3600.0
+    bot.poll_planner.track(posts, now)
+    for post_id in bot.poll_planner.pop_due(now):
+        comments = [
+            {'id': f"{post_id}-{cycle}-{n}", 'author': {'name': f"agent_{n}"}, 'content': 'hello'}
+            for n in range(comments_per_cycle)
+        ]
+        bot.poll_planner.record(post_id, comments, now)
+        for comment in comments:
+            replies += bool(bot.reply_to_comment(post_id, comment))
+    return replies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if per-cycle retained memory grows")
+    parser.add_argument('--cycles', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=50)
+    parser.add_argument('--comments', type=int, default=5)
+    parser.add_argument('--max-growth-bytes', type=int, default=512, help="allowed retained bytes per cycle")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        config = replace(load_config(), state_dir=state_dir, recent_ids_capacity=1000, trace_file=None)
+        bot = MoltbookBot(config)
+        bot.session = StandInSession()
+        posts = [{'id': f"post-{n}"} for n in range(args.posts)]
+
+        # Trace from the start, but let caches and the LRU fill up before measuring,
+        # otherwise replacing untraced warm-up objects shows up as growth
+        tracemalloc.start(25)
+        replies = 0
+        for cycle in range(args.warmup):
+            replies += run_cycle(bot, cycle, posts, args.comments)
+
+        before = tracemalloc.take_snapshot()
+        for cycle in range(args.warmup, args.warmup + args.cycles):
+            replies += run_cycle(bot, cycle, posts, args.comments)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        remembered = len(bot.replied_comment_ids)
+        bot.replied_comment_ids.close()
+
+    # The check is only meaningful if replies went through and the LRU actually spilled to disk
+    print(f"Replies posted: {replies}, replied ids remembered: {remembered}")
+    if replies == 0 or remembered != replies or remembered <= config.recent_ids_capacity:
+        print("FAIL: replies didn't go through, so the reply-tracking state was never exercised")
+        sys.exit(1)
+
+    stats = after.compare_to(before, 'traceback')
+    growth = sum(stat.size_diff for stat in stats)
+    per_cycle = growth / args.cycles
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Retained growth: {growth} bytes over {args.cycles} cycles ({per_cycle:.1f} bytes/cycle)")
+    print(f"Peak RSS: {rss_kb / 1024:.1f} MiB")
+    if per_cycle > args.max_growth_bytes:
+        print("Top allocation sites:")
+        for stat in stats[:5]:
+            print(f"  {stat.size_diff:+d} bytes  {stat.traceback.format()[-1].strip()}")
+        print("FAIL: per-cycle retained memory is growing")
+        sys.exit(1)
+    print("OK: memory is flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Adaptive comment polling for Moltbook Bot
+
+Keeps per-post activity stats and gives every post its own next-poll time.
+Posts that just got comments are polled every few minutes; quiet posts back
+off exponentially towards one poll a day. A heap keyed by next-poll time means
+each tick only touches the posts that are actually due.
+"""
+
+import heapq
+import time
+from datetime import datetime
+
+
+def parse_timestamp(value):
+    """Parse an API timestamp (ISO 8601 or epoch seconds) into epoch seconds, or None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class PostActivity:
+    __slots__ = ('post_id', 'created_at', 'comment_count', 'last_comment_at', 'velocity', 'interval', 'next_poll')
+
+    def __init__(self, post_id, created_at, interval, next_poll):
+        self.post_id = post_id
+        self.created_at = created_at
+        self.comment_count = None  # Unknown until the first poll
+        self.last_comment_at = None
+        self.velocity = 0.0  # Smoothed new comments per hour
+        self.interval = interval
+        self.next_poll = next_poll
+
+
+class PollPlanner:
+    def __init__(self, min_interval=300, max_interval=86400, backoff=2.0, smoothing=0.5):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.posts = {}
+        self._heap = []
+
+    def _clamp(self, seconds):
+        return max(self.min_interval, min(self.max_interval, seconds))
+
+    def _schedule(self, activity, now):
+        activity.next_poll = now + activity.interval
+        heapq.heappush(self._heap, (activity.next_poll, activity.post_id))
+
+    def track(self, posts, now=None):
+        """Register new posts from a listing and forget posts that are no longer listed"""
+        now = time.time() if now is None else now
+        seen = set()
+        for post in posts:
+            post_id = post.get('id') or post.get('post', {}).get('id')
+            if not post_id:
+                continue
+            seen.add(post_id)
+            if post_id in self.posts:
+                # A post that was popped but never recorded goes straight back in the queue
+                if self.posts[post_id].next_poll is None:
+                    self._schedule(self.posts[post_id], now - self.posts[post_id].interval)
+                continue
+
+            # New posts are due now; older ones start at an interval that grows with their age
+            created_at = parse_timestamp(post.get('created_at') or post.get('post', {}).get('created_at'))
+            age = max(0.0, now - created_at) if created_at else 0.0
+            activity = PostActivity(post_id, created_at, self._clamp(age / 24), now)
+            self.posts[post_id] = activity
+            heapq.heappush(self._heap, (now, post_id))
+
+        for post_id in list(self.posts):
+            if post_id not in seen:
+                del self.posts[post_id]
+
+    def pop_due(self, now=None):
+        """Return the ids of posts whose next poll time has come, soonest first"""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_poll, post_id = heapq.heappop(self._heap)
+            activity = self.posts.get(post_id)
+            # Skip entries for forgotten posts or ones that were rescheduled since
+            if activity is None or activity.next_poll != next_poll:
+                continue
+            activity.next_poll = None  # In flight until record() reschedules it
+            due.append(post_id)
+        return due
+
+    def record(self, post_id, comments, now=None, own=(), unanswered=0):
+        """Update a post's stats after polling it and schedule its next poll; `comments` is None if the poll failed
+
+        `own` holds the ids of the bot's own comments, which aren't activity; `unanswered` is how many comments
+        were still left without a reply after this poll, which keeps the post on the shortest interval.
+        """
+        now = time.time() if now is None else now
+        activity = self.posts.get(post_id)
+        if activity is None:
+            return
+        if comments is None:
+            # A failed fetch isn't "no comments": don't back off or reset the count
+            self.defer(post_id, now)
+            return
+
+        others = [comment for comment in comments if comment.get('id') not in own]
+        first_poll = activity.comment_count is None
+        new_comments = 0 if first_poll else max(0, len(others) - activity.comment_count)
+        activity.comment_count = len(others)
+        for comment in others:
+            created_at = parse_timestamp(comment.get('created_at'))
+            if created_at and (activity.last_comment_at is None or created_at > activity.last_comment_at):
+                activity.last_comment_at = created_at
+
+        hours = max(activity.interval, 1) / 3600
+        activity.velocity = self.smoothing * (new_comments / hours) + (1 - self.smoothing) * activity.velocity
+
+        if unanswered:
+            # Replies still owed (over the per-post cap, or throttled or failed): come back soon
+            activity.interval = self.min_interval
+        elif first_poll:
+            # Keep the age-based interval unless the post had a comment recently
+            if activity.last_comment_at and now - activity.last_comment_at < self.max_interval / 24:
+                activity.interval = self.min_interval
+        elif new_comments:
+            # Hot: poll again in a few minutes
+            activity.interval = self.min_interval
+        else:
+            # Quiet: exponential decay towards the daily poll
+            activity.interval = self._clamp(activity.interval * self.backoff)
+        self._schedule(activity, now)
+
+    def defer(self, post_id, now=None):
+        """Put an in-flight post back on its current interval without polling it"""
+        now = time.time() if now is None else now
+        activity = self.posts.get(post_id)
+        if activity is not None:
+            self._schedule(activity, now)
+
+    def next_due_in(self, now=None):
+        """Seconds until the next post is due, or None if nothing is tracked"""
+        now = time.time() if now is None else now
+        while self._heap:
+            next_poll, post_id = self._heap[0]
+            activity = self.posts.get(post_id)
+            if activity is not None and activity.next_poll == next_poll:
+                return max(0.0, next_poll - now)
+            heapq.heappop(self._heap)
+        return None
@@ -0,0 +1,120 @@
+"""
+Cycle profiling for Moltbook Bot
+
+CycleProfiler wraps selected bot cycles in cProfile, a stack sampler and
+tracemalloc, profiling only the first and then every Nth cycle to keep overhead
+low. Each profiled cycle leaves three files in the profile directory:
+
+    <name>-<n>-<ts>.pstats       cProfile stats (load with pstats or snakeviz)
+    <name>-<n>-<ts>.folded       collapsed stacks, ready for flamegraph.pl / speedscope
+    <name>-<n>-<ts>.alloc.txt    top allocation sites by size
+
+Profiling can be toggled at runtime with SIGUSR1, so a production bot can be
+profiled without a restart.
+"""
+
+import cProfile
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class CycleProfiler:
+    def __init__(self, profile_dir='profiles', every_n=10, top_allocations=25, enabled=True):
+        self.profile_dir = profile_dir
+        self.every_n = max(1, every_n)
+        self.top_allocations = top_allocations
+        self.enabled = enabled
+        self.cycles = 0
+
+    def toggle(self, *args):
+        """Flip profiling on or off; usable directly as a signal handler"""
+        self.enabled = not self.enabled
+        logger.info(f"Cycle profiling {'enabled' if self.enabled else 'disabled'}")
+
+    def install_signal_toggle(self, signum=getattr(signal, 'SIGUSR1', None)):
+        """Toggle profiling whenever the process receives `signum` (SIGUSR1 by default)"""
+        if signum is None:
+            logger.warning("Signal toggling is not supported on this platform")
+            return
+        signal.signal(signum, self.toggle)
+
+    @contextmanager
+    def cycle(self, name='cycle'):
+        """Profile the enclosed block if profiling is on and this is an Nth cycle"""
+        self.cycles += 1
+        if not self.enabled or (self.cycles - 1) % self.every_n:
+            yield
+            return
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        prefix = os.path.join(self.profile_dir, f"{name}-{self.cycles}-{int(time.time())}")
+
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(10)
+        sampler = StackSampler(threading.get_ident())
+        profiler = cProfile.Profile()
+
+        sampler.start()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+            profiler.dump_stats(f"{prefix}.pstats")
+            sampler.write(f"{prefix}.folded")
+            with open(f"{prefix}.alloc.txt", 'w') as f:
+                for stat in snapshot.statistics('lineno')[:self.top_allocations]:
+                    f.write(f"{stat}\n")
+            logger.info(f"Profiled {name} #{self.cycles} ({elapsed:.2f}s), wrote {prefix}.*")
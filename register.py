@@ -5,9 +5,18 @@ Registers the bot with the Moltbook API and gets an API key
 """
 
 import requests
+import csv
 import json
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from urllib3.exceptions import NewConnectionError
+
+from atomic_file import atomic_write, locked
+
+REGISTER_URL = 'https://www.moltbook.com/api/v1/agents/register'
 
 def register_agent(agent_name, description):
     """Register a new agent with Moltbook"""
@@ -21,7 +30,7 @@ def register_agent(agent_name, description):
     
     try:
         response = requests.post(
-            'https://www.moltbook.com/api/v1/agents/register',
+            REGISTER_URL,
             json=registration_data,
             headers={'Content-Type': 'application/json'}
         )
@@ -61,30 +70,160 @@ def register_agent(agent_name, description):
 def save_api_key_to_env(api_key):
     """Save the API key to the .env file"""
     
-    env_exists = os.path.exists('.env')
+    with locked('.env'):
+        # Read existing .env content if it exists
+        env_content = ""
+        if os.path.exists('.env'):
+            with open('.env', 'r') as f:
+                env_content = f.read()
+        
+        # Update the existing key line or add a new one
+        lines = env_content.splitlines()
+        for i, line in enumerate(lines):
+            if line.startswith('MOLTBOOK_API_KEY='):
+                lines[i] = f'MOLTBOOK_API_KEY={api_key}'
+                break
+        else:
+            lines.append(f'MOLTBOOK_API_KEY={api_key}')
+        
+        atomic_write('.env', "\n".join(lines) + "\n")
     
-    # Read existing .env content if it exists
-    env_content = ""
-    if env_exists:
-        with open('.env', 'r') as f:
-            env_content = f.read()
+    print(f"API key saved to .env file.")
+
+def save_to_keystore(path, records):
+    """Merge registration records (keyed by agent name) into a JSON keystore atomically"""
+    with locked(path):
+        keystore = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                keystore = json.load(f)
+        for record in records:
+            keystore[record['name']] = record
+        atomic_write(path, json.dumps(keystore, indent=2, sort_keys=True) + "\n")
+
+def load_agent_specs(path):
+    """Read agent names and descriptions from a CSV (name,description header) or JSONL file"""
+    specs = []
+    with open(path, 'r', newline='') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    specs.append((item['name'], item['description']))
+        else:
+            for row in csv.DictReader(f):
+                specs.append((row['name'].strip(), row['description'].strip()))
+    return specs
+
+def _never_sent(error):
+    """Whether a request failed before reaching the server, so retrying it can't register twice"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+def register_with_retry(session, agent_name, description, retries=3, url=REGISTER_URL):
+    """Register one agent without prompting.
     
-    # Check if API key already exists in the file
-    if 'MOLTBOOK_API_KEY=' in env_content:
-        # Update existing key
-        import re
-        env_content = re.sub(r'MOLTBOOK_API_KEY=.*', f'MOLTBOOK_API_KEY={api_key}', env_content)
-    else:
-        # Add new key
-        env_content += f"\nMOLTBOOK_API_KEY={api_key}\n"
+    Registration isn't idempotent: once a request may have reached the server, a retry could only
+    fail with "name taken" and lose the key. So only failures where nothing was sent, and 429s, are
+    retried; timeouts, dropped connections, 5xx responses and unreadable bodies come back as
+    records with outcome 'unknown' to be checked by hand.
+    """
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            # Exponential backoff with jitter so the pool doesn't retry in lockstep
+            time.sleep(min(30, 2 ** attempt) * random.uniform(0.5, 1.5))
+        try:
+            response = session.post(
+                url,
+                json={'name': agent_name, 'description': description},
+                headers={'Content-Type': 'application/json'},
+                timeout=30
+            )
+        except requests.RequestException as e:
+            if _never_sent(e):
+                error = str(e)
+                continue
+            return {'name': agent_name, 'outcome': 'unknown', 'error': str(e)}
+        
+        if response.status_code == 429:
+            error = f"status {response.status_code}"
+            continue
+        if response.status_code >= 500:
+            return {'name': agent_name, 'outcome': 'unknown', 'error': f"status {response.status_code}"}
+        if response.status_code != 200:
+            return {'name': agent_name, 'error': f"status {response.status_code}: {response.text[:200]}"}
+        
+        try:
+            result = response.json()
+        except ValueError:
+            # A 200 means the agent probably exists, but its key can't be read
+            return {'name': agent_name, 'outcome': 'unknown', 'error': f"unreadable response: {response.text[:200]}"}
+        if not isinstance(result, dict):
+            return {'name': agent_name, 'outcome': 'unknown', 'error': f"unexpected response: {response.text[:200]}"}
+        if not result.get('success'):
+            return {'name': agent_name, 'error': result.get('error', 'Unknown error')}
+        agent_data = result.get('agent', {})
+        return {
+            'name': agent_name,
+            'description': description,
+            'api_key': agent_data.get('api_key'),
+            'claim_url': agent_data.get('claim_url'),
+            'verification_code': agent_data.get('verification_code'),
+        }
+    return {'name': agent_name, 'error': error}
+
+def provision_agents(specs, keystore_path='keystore.json', workers=16, retries=3):
+    """Register many agents concurrently, saving each key to the keystore as soon as it arrives"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount('https://', adapter)
     
-    # Write back to file
-    with open('.env', 'w') as f:
-        f.write(env_content)
+    registered, failed = [], []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(register_with_retry, session, name, description, retries): name for name, description in specs}
+        for future in as_completed(futures):
+            # One bad result must not stop the loop, or the keys that arrive after it are never saved
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {'name': futures[future], 'outcome': 'unknown', 'error': str(e)}
+            if record.get('outcome') == 'unknown':
+                failed.append(record)
+                print(f"⚠️  {record['name']}: outcome unknown, check whether it was registered ({record['error']})")
+            elif record.get('error'):
+                failed.append(record)
+                print(f"❌ {record['name']}: {record['error']}")
+            else:
+                # Persist immediately: API keys can't be recovered if we crash later in the run
+                save_to_keystore(keystore_path, [record])
+                registered.append(record)
+                print(f"✅ {record['name']}")
     
-    print(f"API key saved to .env file.")
+    print(f"\nRegistered {len(registered)} of {len(specs)} agents; keys saved to {keystore_path}")
+    unknown = [record['name'] for record in failed if record.get('outcome') == 'unknown']
+    if unknown:
+        print(f"Outcome unknown for {len(unknown)} (not retried, may already exist): {', '.join(unknown)}")
+    return registered, failed
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Register Moltbook agents")
+    parser.add_argument('--bulk', metavar='FILE', help="CSV (name,description) or JSONL file of agents to register")
+    parser.add_argument('--keystore', default='keystore.json', help="where bulk registrations are saved")
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--retries', type=int, default=3)
+    args = parser.parse_args()
+    
+    if args.bulk:
+        registered, failed = provision_agents(load_agent_specs(args.bulk), args.keystore, args.workers, args.retries)
+        if failed:
+            raise SystemExit(1)
+        return
+    
     print("Moltbook Bot Registration")
     print("="*30)
     
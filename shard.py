@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Sharded sweeps for a fleet of Moltbook Bot workers
+
+Post ids (and submolt names) are mapped onto a fixed number of partitions with
+a consistent-hash ring. Workers share a SQLite lease store (SHARD_STORE) on one
+host or on storage every host can lock. Each worker heartbeats to keep time-limited leases
+on its fair share of partitions and only sweeps the posts whose partitions it
+holds, so sweep throughput grows with the number of workers. Leases of a
+worker that stops heartbeating expire and are taken over by the others; when
+a worker joins, the others shed partitions so it gets its share.
+
+Leases decide who does the work. What makes duplicate replies impossible is
+the shared reply table: a worker must insert a comment's id there before
+replying, and only one insert can win, even if a stalled worker briefly keeps
+acting on a lease that has already moved on.
+
+Run `python shard.py --store fleet.sqlite3` to see the current leases.
+"""
+
+import bisect
+import hashlib
+import logging
+import math
+import os
+import socket
+import sqlite3
+import threading
+
+from clock import SYSTEM_CLOCK
+
+logger = logging.getLogger(__name__)
+
+REPLY_RETENTION = 30 * 86400  # Keep fleet-wide reply claims for a month
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class HashRing:
+    """Consistent hashing of keys onto partitions, with virtual nodes for an even spread"""
+
+    def __init__(self, partitions, replicas=32):
+        points = sorted((_hash(f"partition-{p}-{r}"), p) for p in range(partitions) for r in range(replicas))
+        self._points = [point for point, _ in points]
+        self._partitions = [partition for _, partition in points]
+
+    def partition_for(self, key):
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._partitions[index]
+
+
+class LeaseStore:
+    """Partition leases, worker heartbeats and reply claims in a SQLite file shared by the fleet"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS workers (owner TEXT PRIMARY KEY, expires REAL NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS leases (partition INTEGER PRIMARY KEY, owner TEXT NOT NULL, "
+                         "expires REAL NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS replies (comment_id TEXT PRIMARY KEY, owner TEXT NOT NULL, "
+                         "at REAL NOT NULL)")
+
+    def heartbeat(self, owner, partitions, ttl, now):
+        """Renew this worker's leases and rebalance towards a fair share; returns the partitions it holds"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("INSERT INTO workers (owner, expires) VALUES (?, ?) "
+                                 "ON CONFLICT(owner) DO UPDATE SET expires = excluded.expires", (owner, now + ttl))
+                self._db.execute("DELETE FROM workers WHERE expires <= ?", (now,))
+                live = self._db.execute("SELECT COUNT(*) FROM workers").fetchone()[0]
+                share = math.ceil(partitions / max(1, live))
+
+                self._db.execute("UPDATE leases SET expires = ? WHERE owner = ?", (now + ttl, owner))
+                held = [row[0] for row in self._db.execute(
+                    "SELECT partition FROM leases WHERE owner = ? ORDER BY partition", (owner,))]
+                if len(held) > share:
+                    # Shed the surplus so workers that just joined can pick it up
+                    surplus = held[share:]
+                    self._db.executemany("DELETE FROM leases WHERE partition = ? AND owner = ?",
+                                         [(partition, owner) for partition in surplus])
+                    held = held[:share]
+                elif len(held) < share:
+                    taken = {row[0] for row in self._db.execute(
+                        "SELECT partition FROM leases WHERE expires > ?", (now,))}
+                    free = [partition for partition in range(partitions) if partition not in taken]
+                    claimed = free[:share - len(held)]
+                    self._db.executemany(
+                        "INSERT INTO leases (partition, owner, expires) VALUES (?, ?, ?) "
+                        "ON CONFLICT(partition) DO UPDATE SET owner = excluded.owner, expires = excluded.expires",
+                        [(partition, owner, now + ttl) for partition in claimed])
+                    held = sorted(held + claimed)
+
+                self._db.execute("DELETE FROM replies WHERE at < ?", (now - REPLY_RETENTION,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return set(held)
+
+    def release(self, owner):
+        """Give up all of a worker's leases so the rest of the fleet can take them over at once"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM leases WHERE owner = ?", (owner,))
+            self._db.execute("DELETE FROM workers WHERE owner = ?", (owner,))
+            self._db.execute("COMMIT")
+
+    def claim_reply(self, comment_id, owner, now):
+        """Atomically claim a comment for one worker; False if another worker already has"""
+        with self._lock:
+            cursor = self._db.execute("INSERT OR IGNORE INTO replies (comment_id, owner, at) VALUES (?, ?, ?)",
+                                      (str(comment_id), owner, now))
+            return cursor.rowcount == 1
+
+    def unclaim_reply(self, comment_id, owner):
+        """Drop a claim whose reply failed, so it can be retried"""
+        with self._lock:
+            self._db.execute("DELETE FROM replies WHERE comment_id = ? AND owner = ?", (str(comment_id), owner))
+
+    def snapshot(self, now):
+        with self._lock:
+            workers = dict(self._db.execute("SELECT owner, expires FROM workers WHERE expires > ?", (now,)))
+            leases = {}
+            for partition, owner in self._db.execute(
+                    "SELECT partition, owner FROM leases WHERE expires > ? ORDER BY partition", (now,)):
+                leases.setdefault(owner, []).append(partition)
+        return {owner: {'heartbeat_expires_in': expires - now, 'partitions': leases.get(owner, [])}
+                for owner, expires in workers.items()}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ShardCoordinator:
+    """One worker's view of the fleet: which partitions it holds, kept fresh by a heartbeat thread"""
+
+    def __init__(self, store, worker_id=None, partitions=64, lease_seconds=60, clock=SYSTEM_CLOCK):
+        self.store = store
+        self.worker_id = worker_id or default_worker_id()
+        self.partitions = partitions
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self.ring = HashRing(partitions)
+        self.held = set()
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def heartbeat(self):
+        now = self.clock.time()
+        held = self.store.heartbeat(self.worker_id, self.partitions, self.lease_seconds, now)
+        if held != self.held:
+            logger.info(f"Worker {self.worker_id} now holds {len(held)} of {self.partitions} partitions")
+        self.held = held
+        self._valid_until = now + self.lease_seconds
+
+    def _heartbeat_loop(self):
+        # Renew well inside the lease so one slow or failed heartbeat doesn't lose it
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.heartbeat()
+            except sqlite3.Error as e:
+                logger.warning(f"Shard heartbeat failed: {e}")
+
+    def start(self):
+        """Take a first share of partitions, then keep the leases alive in the background"""
+        self.heartbeat()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._heartbeat_loop, name='shard-heartbeat', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop heartbeating and hand our partitions to the rest of the fleet"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.store.release(self.worker_id)
+        self.held = set()
+
+    def owns(self, key):
+        """Whether this worker should handle `key` (a post id or submolt name) right now"""
+        # Leases we couldn't renew may already belong to someone else
+        if self.clock.time() >= self._valid_until:
+            return False
+        return self.ring.partition_for(key) in self.held
+
+    def claim_reply(self, comment_id):
+        return self.store.claim_reply(comment_id, self.worker_id, self.clock.time())
+
+    def unclaim_reply(self, comment_id):
+        self.store.unclaim_reply(comment_id, self.worker_id)
+
+    def snapshot(self):
+        return {
+            'worker_id': self.worker_id,
+            'partitions_held': len(self.held),
+            'partitions': self.partitions,
+            'fleet': self.store.snapshot(self.clock.time()),
+        }
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Show the leases held by a sharded fleet of bots")
+    parser.add_argument('--store', required=True, help="the fleet's SHARD_STORE file")
+    args = parser.parse_args()
+
+    store = LeaseStore(args.store)
+    print(json.dumps(store.snapshot(SYSTEM_CLOCK.time()), indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
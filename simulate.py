@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Virtual-time simulation harness for Moltbook Bot
+
+Runs MoltbookBot.run_continuous against an in-process stand-in for the Moltbook
+API on a VirtualClock, so weeks or months of behaviour (schedule drift, memory
+growth, rate-limit storms, outages) play out in seconds. Simulated users comment
+on the bot's posts at a rate that decays with post age; the stand-in enforces
+per-submolt post and global comment rate limits and can inject outage windows.
+
+Reports throughput, reply latency distribution, missed comments and RSS over
+simulated time. RSS includes the stand-in's own copy of every simulated post
+and comment, so some growth over a long run is expected.
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import random
+import re
+import resource
+import tempfile
+from collections import Counter, defaultdict
+from dataclasses import replace
+
+from clock import SimulationFinished, VirtualClock
+from config import load_config
+from main import MoltbookBot
+
+DAY = 86400
+
+
+def current_rss_mib():
+    """Current resident set size in MiB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StandInResponse:
+    def __init__(self, status_code, data=None, content=None):
+        self.status_code = status_code
+        self.content = content if content is not None else json.dumps(data if data is not None else {}).encode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+
+class StandInAPI:
+    """Minimal in-memory Moltbook API driven by the virtual clock; plugs in as the bot's session"""
+
+    def __init__(self, clock, bot_name, comments_per_post_per_day=4.0, comment_decay_days=3.0,
+                 reply_share=0.3, post_cooldown=1800, comment_cooldown=20, outages=(), latency=0.2, seed=0):
+        self.clock = clock
+        self.bot_name = bot_name
+        self.base_rate = comments_per_post_per_day / DAY
+        self.decay = comment_decay_days * DAY
+        self.reply_share = reply_share
+        self.post_cooldown = post_cooldown
+        self.comment_cooldown = comment_cooldown
+        self.outages = list(outages)
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+        self.posts = {}  # post_id -> {'id', 'created_at', 'comments': [...]}
+        self.unanswered = defaultdict(dict)  # post_id -> {comment_id: created_at} of user comments awaiting a reply
+        self._arrivals = []  # heap of (time, post_id)
+        self._last_post = {}  # submolt -> time of our last post there
+        self._last_comment = None
+        self._next_id = 0
+
+        self.requests = Counter()
+        self.user_comments = 0
+        self.bot_posts = 0
+        self.bot_replies = 0
+        self.reply_latencies = []
+        self.rss_samples = []
+        self._next_sample = clock.time()
+
+    def _id(self, prefix):
+        self._next_id += 1
+        return f"{prefix}-{self._next_id}"
+
+    def _schedule_arrival(self, post_id, after):
+        age = after - self.posts[post_id]['created_at']
+        rate = self.base_rate * math.exp(-age / self.decay)
+        if rate * DAY < 1e-3:
+            return  # Post has gone cold for good
+        heapq.heappush(self._arrivals, (after + self.rng.expovariate(rate), post_id))
+
+    def _generate_comments(self, now):
+        while self._arrivals and self._arrivals[0][0] <= now:
+            at, post_id = heapq.heappop(self._arrivals)
+            post = self.posts[post_id]
+            post['body'] = None
+            comment_id = self._id('comment')
+            # Some users answer the bot's replies rather than the post itself
+            parent_id = self.rng.choice(post['own']) if post['own'] and self.rng.random() < self.reply_share else None
+            post['comments'].append({
+                'id': comment_id,
+                'author': {'name': f"agent_{self.rng.randint(1, 500)}"},
+                'content': 'Simulated comment',
+                'parent_id': parent_id,
+                'created_at': at,
+            })
+            self.unanswered[post_id][comment_id] = at
+            self.user_comments += 1
+            self._schedule_arrival(post_id, at)
+
+    def _sample(self, now):
+        while now >= self._next_sample:
+            self.rss_samples.append((self._next_sample, current_rss_mib()))
+            self._next_sample += DAY
+
+    def _comments_body(self, post):
+        # Cache the encoded body until the next comment lands, like a real API's response cache
+        if post.get('body') is None:
+            post['body'] = json.dumps({'comments': post['comments']}).encode('utf-8')
+        return post['body']
+
+    def _in_outage(self, now):
+        return any(start <= now < end for start, end in self.outages)
+
+    def request(self, method, url, params=None, json=None, headers=None, **kwargs):
+        self.clock.advance(self.latency)
+        now = self.clock.time()
+        self._generate_comments(now)
+        self._sample(now)
+
+        path = url.split('/api/v1', 1)[-1]
+        route = re.sub(r'/(post|comment)-\d+', r'/{id}', path.split('?')[0])
+        self.requests[f"{method} {route}"] += 1
+
+        if self._in_outage(now):
+            return StandInResponse(503, {'error': 'Service unavailable'})
+
+        if method == 'GET' and path == '/agents/me':
+            return StandInResponse(200, {'agent': {'id': 'bot', 'name': self.bot_name}})
+        if method == 'GET' and path.startswith('/posts') and route == '/posts':
+            posts = [{'id': p['id'], 'created_at': p['created_at']} for p in self.posts.values()]
+            return StandInResponse(200, {'posts': posts})
+        if method == 'GET' and route == '/posts/{id}/comments':
+            post = self.posts.get(path.split('/')[2])
+            if post is None:
+                return StandInResponse(404, {'error': 'Post not found'})
+            return StandInResponse(200, content=self._comments_body(post))
+        if method == 'POST' and path == '/posts':
+            submolt = (json or {}).get('submolt', 'general')
+            if submolt in self._last_post and now - self._last_post[submolt] < self.post_cooldown:
+                return StandInResponse(429, {'error': 'You can only post once every 30 minutes'})
+            self._last_post[submolt] = now
+            post_id = self._id('post')
+            self.posts[post_id] = {'id': post_id, 'created_at': now, 'comments': [], 'own': []}
+            self.bot_posts += 1
+            self._schedule_arrival(post_id, now)
+            return StandInResponse(201, {'post': {'id': post_id}})
+        if method == 'POST' and route == '/posts/{id}/comments':
+            post = self.posts.get(path.split('/')[2])
+            if post is None:
+                return StandInResponse(404, {'error': 'Post not found'})
+            if self._last_comment is not None and now - self._last_comment < self.comment_cooldown:
+                return StandInResponse(429, {'error': 'Slow down'})
+            self._last_comment = now
+            post['body'] = None
+            comment_id = self._id('comment')
+            parent_id = (json or {}).get('parent_id')
+            post['comments'].append({'id': comment_id, 'author': {'name': self.bot_name}, 'parent_id': parent_id,
+                                     'content': (json or {}).get('content', ''), 'created_at': now})
+            post['own'].append(comment_id)
+            self.bot_replies += 1
+            waiting = self.unanswered[post['id']]
+            if parent_id in waiting:
+                self.reply_latencies.append(now - waiting.pop(parent_id))
+            elif parent_id is None and waiting:
+                # A top-level reply is credited to the oldest waiting comment
+                self.reply_latencies.append(now - waiting.pop(next(iter(waiting))))
+            return StandInResponse(201, {'success': True})
+        return StandInResponse(404, {'error': 'Not found'})
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(api, days):
+    missed = sum(len(queue) for queue in api.unanswered.values())
+    total_requests = sum(api.requests.values())
+    print(f"Simulated {days:g} days")
+    print(f"Throughput: {api.bot_posts / days:.1f} posts/day, {api.bot_replies / days:.1f} replies/day, "
+          f"{total_requests / days:.0f} requests/day")
+    print(f"Comments: {api.user_comments} from users, {missed} never answered "
+          f"({100.0 * missed / max(1, api.user_comments):.1f}%)")
+    minutes = [latency / 60 for latency in api.reply_latencies]
+    print(f"Reply latency (minutes): p50 {percentile(minutes, 50):.1f}, p90 {percentile(minutes, 90):.1f}, "
+          f"p99 {percentile(minutes, 99):.1f}, max {max(minutes, default=float('nan')):.1f}")
+    print("Requests by route:")
+    for route, count in api.requests.most_common():
+        print(f"  {count:>8}  {route}")
+    print("RSS over simulated time (MiB):")
+    start = api.rss_samples[0][0] if api.rss_samples else 0
+    step = max(1, len(api.rss_samples) // 10)
+    for at, rss in api.rss_samples[::step]:
+        print(f"  day {(at - start) / DAY:>5.0f}: {rss:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot against a stand-in API in virtual time")
+    parser.add_argument('--days', type=float, default=30)
+    parser.add_argument('--comment-rate', type=float, default=4.0, help="comments per new post per day")
+    parser.add_argument('--comment-decay-days', type=float, default=3.0)
+    parser.add_argument('--outage', action='append', default=[], metavar='START_DAY:HOURS',
+                        help="inject an outage, e.g. 3:6 for six hours starting on day 3")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    random.seed(args.seed)
+
+    start = 1_700_000_000.0
+    clock = VirtualClock(start=start, end=start + args.days * DAY)
+    outages = []
+    for spec in args.outage:
+        day, hours = spec.split(':')
+        outages.append((start + float(day) * DAY, start + float(day) * DAY + float(hours) * 3600))
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        config = replace(load_config(), username='SimBot', state_dir=state_dir, trace_file=None)
+        bot = MoltbookBot(config, clock=clock)
+        api = StandInAPI(clock, 'SimBot', comments_per_post_per_day=args.comment_rate,
+                         comment_decay_days=args.comment_decay_days, outages=outages, seed=args.seed)
+        bot.session = api
+        try:
+            bot.run_continuous(watch_config=False)
+        except SimulationFinished:
+            pass
+
+    report(api, args.days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Comment thread index for Moltbook Bot
+
+Built from a post's comment list in one pass, ThreadIndex links every comment
+to its parent and records which comments the bot wrote, so "has this comment
+already been answered?" and "is this a reply to us?" are set lookups rather
+than scans of the thread or extra API calls.
+
+Comments may arrive flat with a `parent_id` (or `parent: {id}`), or nested
+under `replies`; both shapes are indexed the same way.
+"""
+
+from collections import defaultdict
+
+
+def _parent_id(comment):
+    parent = comment.get('parent_id')
+    if parent is None and isinstance(comment.get('parent'), dict):
+        parent = comment['parent'].get('id')
+    return parent
+
+
+def _author(comment):
+    author = comment.get('author')
+    if isinstance(author, dict):
+        return author.get('name')
+    return author
+
+
+class ThreadIndex:
+    def __init__(self, comments, own_name):
+        self.comments = {}  # comment id -> comment, in thread order
+        self.parents = {}  # comment id -> parent comment id
+        self.children = defaultdict(list)  # parent comment id -> child comment ids
+        self.own = set()  # ids of comments the bot wrote
+        self.answered = set()  # ids of comments the bot has replied to
+
+        stack = list(reversed(comments))
+        while stack:
+            comment = stack.pop()
+            if not isinstance(comment, dict):
+                continue
+            comment_id = comment.get('id')
+            parent_id = _parent_id(comment)
+            if comment_id is not None:
+                self.comments[comment_id] = comment
+                if parent_id is not None:
+                    self.parents[comment_id] = parent_id
+                    self.children[parent_id].append(comment_id)
+                # Without a known name (no MOLTBOOK_USERNAME, profile not fetched yet) nothing counts as ours,
+                # rather than every comment that lacks an author
+                if own_name and _author(comment) == own_name:
+                    self.own.add(comment_id)
+                    if parent_id is not None:
+                        self.answered.add(parent_id)
+            # Nested replies: index them next, carrying the parent link down
+            replies = comment.get('replies')
+            if isinstance(replies, list):
+                for reply in reversed(replies):
+                    if isinstance(reply, dict) and _parent_id(reply) is None and comment_id is not None:
+                        reply = dict(reply, parent_id=comment_id)
+                    stack.append(reply)
+
+    def __len__(self):
+        return len(self.comments)
+
+    def is_own(self, comment_id):
+        return comment_id in self.own
+
+    def is_answered(self, comment_id):
+        """Whether the bot has already replied to this comment in the thread"""
+        return comment_id in self.answered
+
+    def is_reply_to_us(self, comment_id):
+        """Whether this comment replies to one of the bot's comments"""
+        return self.parents.get(comment_id) in self.own
+
+    def replies_to_us(self):
+        """Comments from others that reply to one of the bot's comments, in thread order"""
+        return [comment for comment_id, comment in self.comments.items()
+                if comment_id not in self.own and self.parents.get(comment_id) in self.own]
+
+    def unanswered(self):
+        """Comments from others that the bot hasn't replied to, replies to the bot first"""
+        pending = [comment for comment_id, comment in self.comments.items()
+                   if comment_id not in self.own and comment_id not in self.answered]
+        # Stable sort: conversations the bot is already part of come first, otherwise thread order
+        pending.sort(key=lambda comment: not self.is_reply_to_us(comment['id']))
+        return pending
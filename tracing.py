@@ -0,0 +1,272 @@
+"""
+Span-based tracing for Moltbook Bot
+
+Records nested spans (start/end time plus attributes such as post_id, route,
+status and bytes) for each bot cycle. Finished traces are buffered in memory
+and appended to a JSONL file by a background thread, one span per line in the
+OpenTelemetry (OTLP/JSON) span shape. When a root span ends, a critical-path
+summary of that trace is logged so you can see where a cycle's time went.
+
+Tracing is off unless the bot is given a trace file (TRACE_FILE in `.env`).
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+
+def _attribute_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class Span:
+    __slots__ = ('tracer', 'trace_id', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'status')
+
+    def __init__(self, tracer, name, trace_id, parent_id, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.status = STATUS_UNSET
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_status(self, ok):
+        self.status = STATUS_OK if ok else STATUS_ERROR
+
+    @property
+    def duration(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def __enter__(self):
+        self.tracer._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.status = STATUS_ERROR
+            self.attributes['exception.type'] = exc_type.__name__
+        self.end_ns = time.time_ns()
+        self.tracer._pop(self)
+        return False
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [{'key': k, 'value': _attribute_value(v)} for k, v in self.attributes.items() if v is not None],
+            'status': {'code': self.status},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class _NullSpan:
+    """Stand-in returned when tracing is off; accepts and ignores everything"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_status(self, ok):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, path=None, service_name='moltbook-bot', flush_interval=5.0, summarize=True):
+        self.path = path
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self.summarize = summarize
+        self._local = threading.local()
+        self._traces = defaultdict(list)  # trace_id -> finished spans of an open trace
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        if path:
+            self._thread = threading.Thread(target=self._flush_loop, name='trace-flusher', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    @property
+    def enabled(self):
+        return bool(self.path) and not self._closed
+
+    def span(self, name, **attributes):
+        """Start a span as a child of the current thread's active span"""
+        if not self.enabled:
+            return NULL_SPAN
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        return Span(self, name, trace_id, parent.span_id if parent else None, attributes)
+
+    def current(self):
+        """The active span on this thread, or a null span"""
+        stack = self._stack() if self.enabled else None
+        return stack[-1] if stack else NULL_SPAN
+
+    @contextmanager
+    def attach(self, span):
+        """Parent the spans this thread starts inside the block to `span`, e.g. one from a pool's caller"""
+        if span is NULL_SPAN or not self.enabled:
+            yield
+            return
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield
+        finally:
+            # Only detach; the span is finished (and recorded) by the thread that started it
+            if stack and stack[-1] is span:
+                stack.pop()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, span):
+        self._stack().append(span)
+
+    def _pop(self, span):
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        with self._lock:
+            spans = self._traces[span.trace_id]
+            spans.append(span)
+            if span.parent_id is not None:
+                return
+            # Root finished: the whole trace is complete
+            del self._traces[span.trace_id]
+            self._buffer.extend(spans)
+        if self.summarize:
+            logger.info(critical_path_summary(spans))
+        if len(self._buffer) >= 1000:
+            self._wake.set()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write buffered spans to the JSONL file"""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not spans:
+            return
+        resource = {'service.name': self.service_name}
+        try:
+            with open(self.path, 'a') as f:
+                for span in spans:
+                    record = span.to_otlp()
+                    record['resource'] = resource
+                    f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            logger.error(f"Could not write traces to {self.path}: {e}")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self.path:
+            self.flush()
+
+
+def critical_path_summary(spans):
+    """Describe the longest chain of nested spans and where self time went in one trace"""
+    children = defaultdict(list)
+    root = None
+    for span in spans:
+        if span.parent_id is None:
+            root = span
+        else:
+            children[span.parent_id].append(span)
+    if root is None:
+        return "Trace has no root span"
+
+    path = [root]
+    while children.get(path[-1].span_id):
+        path.append(max(children[path[-1].span_id], key=lambda s: s.duration))
+
+    self_time = defaultdict(float)
+    counts = defaultdict(int)
+    for span in spans:
+        child_time = sum(child.duration for child in children.get(span.span_id, ()))
+        self_time[span.name] += max(0.0, span.duration - child_time)
+        counts[span.name] += 1
+    top = sorted(self_time.items(), key=lambda item: item[1], reverse=True)[:5]
+
+    chain = ' > '.join(f"{span.name} {span.duration:.2f}s" for span in path)
+    breakdown = ', '.join(f"{name} {seconds:.2f}s ({counts[name]}x)" for name, seconds in top)
+    return f"Trace {root.name} {root.duration:.2f}s | critical path: {chain} | self time: {breakdown}"
+
+
+def traced(*recorded_args, name=None):
+    """Decorate a bot method so each call runs in a span on `self.tracer`, recording the named arguments"""
+    def decorator(method):
+        span_name = name or method.__name__
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, 'tracer', None)
+            if tracer is None or not tracer.enabled:
+                return method(self, *args, **kwargs)
+            attributes = {}
+            if recorded_args:
+                bound = signature.bind_partial(self, *args, **kwargs).arguments
+                attributes = {arg: bound.get(arg) for arg in recorded_args}
+            with tracer.span(span_name, **attributes) as span:
+                result = method(self, *args, **kwargs)
+                if isinstance(result, bool):
+                    span.set_status(result)
+                elif isinstance(result, list):
+                    span.set_attribute('result.count', len(result))
+                return result
+        return wrapper
+    return decorator
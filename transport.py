@@ -0,0 +1,159 @@
+"""
+HTTP transports for Moltbook Bot
+
+The bot talks to the API through a session object with the requests interface
+(`request`, `get`, `post`, redirects followed, responses with `status_code`,
+`content`, `text`, `json()` and `headers`). make_session picks the backend:
+
+    HTTP_TRANSPORT=http1   requests.Session with a connection pool sized for
+                           FETCH_CONCURRENCY (default)
+    HTTP_TRANSPORT=http2   httpx.Client with HTTP/2, so concurrent comment reads
+                           and replies are multiplexed over one connection
+                           (needs `pip install httpx[http2]`; falls back to
+                           http1 if httpx or h2 is missing)
+
+Run `python transport.py` to benchmark both against a local h2-capable
+stand-in server (needs hypercorn).
+"""
+
+import logging
+
+import requests
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  httpx only imports it once a client asks for HTTP/2
+except ImportError:
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+
+class Http2Session:
+    """requests-compatible session backed by an HTTP/2 httpx.Client"""
+
+    def __init__(self, max_connections=10, timeout=30.0, prior_knowledge=False):
+        if httpx is None or h2 is None:
+            raise RuntimeError("HTTP/2 transport needs httpx and h2: pip install 'httpx[http2]'")
+        # prior_knowledge speaks h2 over cleartext http:// (local stand-ins); TLS endpoints negotiate via ALPN
+        self.client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,  # requests follows redirects by default; httpx doesn't
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None, allow_redirects=True,
+                **kwargs):
+        if kwargs:
+            raise TypeError(f"Http2Session.request() does not support {', '.join(sorted(kwargs))}")
+        # Translate httpx errors so callers keep catching requests.RequestException
+        try:
+            return self.client.request(method, url, params=params, json=json, headers=headers,
+                                       timeout=timeout or self.client.timeout, follow_redirects=allow_redirects)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+def make_session(transport='http1', concurrency=1):
+    """Build the session for the configured transport, falling back to HTTP/1.1 if httpx or h2 is missing"""
+    size = max(10, concurrency)
+    if transport == 'http2':
+        try:
+            return Http2Session(max_connections=size)
+        except (RuntimeError, ImportError) as e:
+            logger.warning(f"HTTP_TRANSPORT=http2 unavailable ({e}); using HTTP/1.1")
+    session = requests.Session()
+    session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size))
+    session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size))
+    return session
+
+
+def _stand_in_app(comments_per_post, latency):
+    """ASGI app answering comment reads and writes after a simulated server delay"""
+    import asyncio
+    import json
+
+    body = json.dumps({'comments': [
+        {'id': f"comment-{n}", 'author': {'name': f"agent_{n}"}, 'content': 'Simulated comment ' * 5}
+        for n in range(comments_per_post)
+    ]}).encode('utf-8')
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        await asyncio.sleep(latency)
+        status, payload = (200, body) if scope['method'] == 'GET' else (201, b'{"success": true}')
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    return app
+
+
+def main():
+    import argparse
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    parser = argparse.ArgumentParser(description="Benchmark HTTP/1.1 vs HTTP/2 transports on high-fanout comment reads")
+    parser.add_argument('--posts', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--comments', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02, help="simulated server delay per request (seconds)")
+    parser.add_argument('--port', type=int, default=8899)
+    args = parser.parse_args()
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{args.port}"]
+    config.accesslog = None
+    config.errorlog = None
+    loop = asyncio.new_event_loop()
+    # A shutdown trigger stops hypercorn installing signal handlers, which only work on the main thread
+    server = serve(_stand_in_app(args.comments, args.latency), config, shutdown_trigger=lambda: asyncio.Future())
+    threading.Thread(target=loop.run_until_complete, args=(server,), daemon=True).start()
+    time.sleep(1)
+
+    base_url = f"http://127.0.0.1:{args.port}/api/v1"
+    backends = [
+        ('http1 (requests)', make_session('http1', args.concurrency)),
+        ('http2 (httpx)', Http2Session(max_connections=4, prior_knowledge=True)),
+    ]
+    for label, session in backends:
+        def fetch(n):
+            response = session.get(f"{base_url}/posts/post-{n}/comments")
+            session.post(f"{base_url}/posts/post-{n}/comments", json={'content': 'Thanks!'})
+            return len(response.content)
+
+        fetch(0)  # Warm up the connection
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            total_bytes = sum(pool.map(fetch, range(args.posts)))
+        elapsed = time.perf_counter() - started
+        print(f"{label:<18} {args.posts} reads + {args.posts} writes in {elapsed:.2f}s "
+              f"({2 * args.posts / elapsed:.0f} req/s, {total_bytes / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
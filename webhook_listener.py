@@ -0,0 +1,184 @@
+"""
+Push ingestion for Moltbook Bot
+
+A small local HTTP listener that accepts comment/notification events (from the
+platform's notification feed or a relay) and drops them onto an in-process queue
+for the bot's reply workers. EventGenerator is a local stand-in for the relay.
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_event(event):
+    """Turn an incoming event into {'post_id': ..., 'comment': {...}} or None"""
+    if not isinstance(event, dict):
+        return None
+
+    # Notification feed shape: {'type': 'comment', 'post': {...}, 'comment': {...}}
+    if event.get('type') not in (None, 'comment', 'reply', 'comment.created'):
+        return None
+
+    comment = event.get('comment')
+    if not isinstance(comment, dict):
+        # Flat relay shape: {'post_id', 'comment_id', 'author', 'content'}
+        author = event.get('author')
+        comment = {
+            'id': event.get('comment_id') or event.get('id'),
+            'author': author if isinstance(author, dict) else {'name': author or 'Unknown'},
+            'content': event.get('content', ''),
+            'parent_id': event.get('parent_id'),
+        }
+
+    post_id = event.get('post_id') or comment.get('post_id') or (event.get('post') or {}).get('id')
+    if not post_id or not comment.get('id'):
+        return None
+
+    return {'post_id': post_id, 'comment': comment}
+
+
+class _EventHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        token = self.server.token
+        if token and self.headers.get('Authorization') != f'Bearer {token}':
+            self._reply(401, {'error': 'unauthorized'})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._reply(400, {'error': 'invalid JSON'})
+            return
+
+        # Accept a single event, a list of events or {'events': [...]}
+        if isinstance(payload, dict) and isinstance(payload.get('events'), list):
+            events = payload['events']
+        elif isinstance(payload, list):
+            events = payload
+        else:
+            events = [payload]
+
+        accepted = 0
+        for event in events:
+            normalized = normalize_event(event)
+            if not normalized:
+                continue
+            try:
+                self.server.events.put_nowait(normalized)
+                accepted += 1
+            except queue.Full:
+                logger.warning("Event queue is full, dropping event (reconciliation will catch it)")
+                break
+
+        self._reply(202, {'accepted': accepted})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("Webhook %s - %s", self.address_string(), format % args)
+
+
+class CommentEventListener:
+    def __init__(self, host='127.0.0.1', port=8787, token=None, max_queue_size=10000):
+        self.events = queue.Queue(maxsize=max_queue_size)
+        self.server = ThreadingHTTPServer((host, port), _EventHandler)
+        self.server.daemon_threads = True
+        self.server.events = self.events
+        self.server.token = token
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/events"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name='webhook-listener', daemon=True)
+        self._thread.start()
+        logger.info(f"Listening for comment events on {self.url}")
+
+    def stop(self):
+        """Stop the listener and release the socket"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+class EventGenerator:
+    """Local stand-in for the notification relay, used to exercise push mode"""
+
+    def __init__(self, url, token=None):
+        self.url = url
+        self.token = token
+
+    def send(self, events):
+        """POST a batch of events to the listener, returning the accepted count"""
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({'events': events}).encode('utf-8'),
+            headers=headers,
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read()).get('accepted', 0)
+
+    def fake_comment(self, post_id, author=None):
+        """Build a synthetic comment event for a post"""
+        return {
+            'type': 'comment',
+            'post_id': post_id,
+            'comment': {
+                'id': uuid.uuid4().hex,
+                'author': {'name': author or f"agent_{random.randint(1, 999)}"},
+                'content': "Synthetic comment from the local event generator",
+            }
+        }
+
+    def run(self, post_ids, count=10, interval_seconds=1.0):
+        """Send `count` synthetic comments spread over the given posts"""
+        sent = 0
+        for _ in range(count):
+            sent += self.send([self.fake_comment(random.choice(post_ids))])
+            time.sleep(interval_seconds)
+        return sent
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Send synthetic comment events to a push-mode bot")
+    parser.add_argument('--url', default='http://127.0.0.1:8787/events')
+    parser.add_argument('--token', default=None)
+    parser.add_argument('--post-id', action='append', required=True, dest='post_ids')
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--interval', type=float, default=1.0)
+    args = parser.parse_args()
+
+    generator = EventGenerator(args.url, token=args.token)
+    sent = generator.run(args.post_ids, count=args.count, interval_seconds=args.interval)
+    print(f"Sent {sent} events to {args.url}")
+
+
+if __name__ == "__main__":
+    main()